@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,7 +56,8 @@ ROOT_URLCONF = 'ai_zoomcamp.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, timed for the Server-Timing header.
+        'BACKEND': 'core.instrumentation.ProfiledDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -69,14 +72,72 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'ai_zoomcamp.wsgi.application'
 
+# Request instrumentation (core/instrumentation.py): requests slower than
+# SLOW_REQUEST_MS are logged with their SQL, and a SELECT repeated
+# N_PLUS_ONE_THRESHOLD times with different parameters is flagged as N+1.
+SLOW_REQUEST_MS = 500
+N_PLUS_ONE_THRESHOLD = 5
+
+# Serve the async task views (core.async_urls). asgi.py turns this on; under
+# WSGI the sync views avoid running an event loop per request.
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS', '0') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Production SQLite profile:
+# - WAL lets readers run alongside the single writer; synchronous=NORMAL is
+#   durable across application crashes in WAL mode and avoids an fsync per
+#   commit.
+# - mmap_size/cache_size keep hot pages in memory (256 MiB mapped, 64 MiB
+#   page cache per connection).
+# - IMMEDIATE transactions take the write lock up front, so a transaction
+#   waits on the busy timeout instead of failing with "database is locked"
+#   when it upgrades from read to write.
+# - Connections persist between requests under WSGI. Under ASGI each request
+#   runs its sync code in a fresh thread, so connections are closed instead.
+# Task writes are additionally funnelled through one writer thread, see
+# core/writer.py.
+
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -65536',
+    'PRAGMA temp_store = MEMORY',
+]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': '; '.join(SQLITE_PRAGMAS),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        'CONN_MAX_AGE': 0 if ASYNC_VIEWS else 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {
+            # A file rather than the default in-memory database, so tests run
+            # with the same journal mode and locking as production.
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The task list caches rendered fragments here. Local memory is per process;
+# when running several worker processes switch to FileBasedCache so that
+# invalidation reaches all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ai_zoomcamp',
     }
 }
 
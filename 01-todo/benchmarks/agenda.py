@@ -0,0 +1,67 @@
+"""
+Agenda queries over the partial (completed, due_date) index.
+
+Times the agenda page, the single-query bucket counts against one COUNT
+query per bucket and against a GROUP BY over a CASE on due_date, and each bucket's first page against the same range written with a
+plain completed=False filter, which renders as NOT "completed" and so can't
+use the partial index.
+
+    python -m benchmarks.agenda [sizes...]   # default: 1000000
+"""
+from .common import grow_to, measure, parse_sizes, print_row, setup_django
+
+PAGE_SIZE = 20
+
+
+def main():
+    setup_django(instrument=False)
+
+    from django.db.models import Case, CharField, Count, Value, When
+    from django.test import Client
+    from django.urls import reverse
+    from core.agenda import BUCKETS, bucket_bounds, bucket_queryset, get_bucket_counts
+    from core.models import Task
+
+    client = Client()
+
+    for size in parse_sizes([1_000_000]):
+        grow_to(size)
+        bounds = bucket_bounds()
+
+        def separate_counts():
+            return [bucket_queryset(bucket, bounds).count() for bucket in BUCKETS]
+
+        def grouped_counts():
+            bucket = Case(
+                *[When(due_date__lt=bounds[name][1], then=Value(name)) for name in BUCKETS],
+                output_field=CharField(),
+            )
+            return list(
+                Task.objects.pending().filter(due_date__lt=bounds[BUCKETS[-1]][1])
+                .order_by().values_list(bucket).annotate(Count('pk'))
+            )
+
+        def indexed_page(bucket):
+            queryset = bucket_queryset(bucket, bounds)
+            return lambda: list(queryset[:PAGE_SIZE])
+
+        def naive_page(bucket):
+            start, end = bounds[bucket]
+            queryset = Task.objects.filter(completed=False, due_date__lt=end)
+            if start is not None:
+                queryset = queryset.filter(due_date__gte=start)
+            return lambda: list(queryset.order_by('due_date', 'id')[:PAGE_SIZE])
+
+        print(f'buckets: {get_bucket_counts(bounds)}')
+        print_row('GET /agenda/', size, measure(lambda: client.get(reverse('agenda')), iterations=20))
+        print_row('bucket counts (1 query)', size, measure(lambda: get_bucket_counts(bounds), iterations=20))
+        print_row('count per bucket (3 queries)', size, measure(separate_counts, iterations=20))
+        print_row('GROUP BY CASE (1 query)', size, measure(grouped_counts, iterations=20))
+        for bucket in BUCKETS:
+            print_row(f'{bucket} page (partial index)', size, measure(indexed_page(bucket), iterations=20))
+            print_row(f'{bucket} page (NOT completed)', size, measure(naive_page(bucket), iterations=5))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Live-table latency before and after archiving completed tasks.
+
+Seeds a year of tasks, times the list page, the 304 path and the section
+counts, archives everything completed more than 30 days ago and times them
+again.
+
+    python -m benchmarks.archive [sizes...]   # default: 300000
+"""
+import time
+
+from .common import grow_to, measure, parse_sizes, print_row, setup_django
+
+
+def main():
+    setup_django(instrument=False)
+
+    from django.test import Client
+    from django.urls import reverse
+    from core.archive import archive_completed
+    from core.models import Task
+    from core.views import TaskListView
+
+    client = Client()
+    url = reverse('task_list')
+
+    def run(label, size):
+        etag = client.get(url)['ETag']
+        print_row(f'GET / {label}', size, measure(lambda: client.get(url), iterations=20))
+        print_row(f'GET / 304 {label}', size, measure(
+            lambda: client.get(url, headers={'if_none_match': etag}), iterations=20))
+        print_row(f'count query {label}', size, measure(TaskListView().get_section_counts, iterations=20))
+
+    for size in parse_sizes([300_000]):
+        grow_to(size)
+        run('(before)', size)
+
+        start = time.perf_counter()
+        archived = archive_completed(days=30)
+        elapsed = time.perf_counter() - start
+        print(f'archived {archived:,} tasks in {elapsed:.1f}s ({archived / elapsed:,.0f} rows/s), '
+              f'{Task.objects.count():,} left live')
+
+        run('(after)', size)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Shared helpers for the todo app benchmarks.
+
+Benchmarks run against a throwaway SQLite database in a temporary directory,
+so they never touch db.sqlite3. Run them from the 01-todo directory, e.g.:
+
+    python -m benchmarks.task_list
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(instrument=True):
+    """
+    Configure Django against a temporary database and create the schema.
+
+    With `instrument`, templates record their context on test client
+    responses (as in tests); turn it off when measuring throughput.
+    """
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_zoomcamp.settings')
+
+    from django.conf import settings
+    tmpdir = tempfile.mkdtemp(prefix='todo-bench-')
+    settings.DATABASES['default']['NAME'] = Path(tmpdir) / 'bench.sqlite3'
+    django.setup()
+
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+    if instrument:
+        setup_test_environment()
+    else:
+        settings.ALLOWED_HOSTS = ['testserver']
+    call_command('migrate', verbosity=0)
+
+
+def seed_tasks(count, completed_ratio=0.7, seed=0):
+    """Insert `count` generated tasks; roughly `completed_ratio` are completed."""
+    from core.seeding import seed_tasks
+
+    seed_tasks(count, completed_ratio=completed_ratio, seed=seed)
+
+
+def grow_to(count):
+    """Seed tasks until the table holds `count` rows."""
+    from core.models import Task
+
+    existing = Task.objects.count()
+    if existing < count:
+        seed_tasks(count - existing, seed=existing)
+
+
+def percentiles(samples):
+    """p50/p95/p99/max of latency samples in milliseconds."""
+    samples = sorted(samples)
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[max(int(len(samples) * 0.95) - 1, 0)],
+        'p99': samples[max(int(len(samples) * 0.99) - 1, 0)],
+        'max': samples[-1],
+    }
+
+
+def measure(func, iterations=50, warmup=3):
+    """Run `func` repeatedly and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return percentiles(samples)
+
+
+def parse_sizes(default):
+    """Table sizes from the command line (e.g. `10000 100000`), or `default`."""
+    return [int(arg.replace('_', '')) for arg in sys.argv[1:]] or default
+
+
+def print_row(label, size, timings):
+    print(f"{label:<28} {size:>10,} rows   "
+          f"p50 {timings['p50']:8.2f} ms   p95 {timings['p95']:8.2f} ms   max {timings['max']:8.2f} ms")
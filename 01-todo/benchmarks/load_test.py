@@ -0,0 +1,133 @@
+"""
+Throughput and tail latency of the todo app under WSGI and under ASGI.
+
+Each mode runs in its own process against a fresh seeded database. WSGI is
+driven by a pool of threads using the test client (one request per thread
+at a time, as a threaded WSGI server would). ASGI is driven by concurrent
+coroutines using the async test client, which routes to the async views.
+The workload is mostly list page reads with some toggles mixed in.
+
+    python -m benchmarks.load_test [--concurrency 16] [--duration 10] [--tasks 10000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import BASE_DIR, percentiles, seed_tasks, setup_django
+
+TOGGLE_RATIO = 0.1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per mode')
+    parser.add_argument('--tasks', type=int, default=10_000, help='rows to seed')
+    parser.add_argument('--mode', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def pick_request(rng, task_ids):
+    if rng.random() < TOGGLE_RATIO:
+        return 'post', f'/task/{rng.choice(task_ids)}/toggle/'
+    return 'get', '/'
+
+
+def run_wsgi(args, task_ids):
+    from django.test import Client
+
+    deadline = time.perf_counter() + args.duration
+    lock = threading.Lock()
+    samples, errors = [], 0
+
+    def worker(seed):
+        nonlocal errors
+        client = Client(raise_request_exception=False)
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            method, url = pick_request(rng, task_ids)
+            start = time.perf_counter()
+            response = getattr(client, method)(url)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                samples.append(elapsed)
+                errors += response.status_code >= 500
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(worker, range(args.concurrency)))
+    return samples, errors
+
+
+def run_asgi(args, task_ids):
+    from django.test import AsyncClient
+
+    samples, errors = [], 0
+
+    async def worker(seed, deadline):
+        nonlocal errors
+        client = AsyncClient(raise_request_exception=False)
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            method, url = pick_request(rng, task_ids)
+            start = time.perf_counter()
+            response = await getattr(client, method)(url)
+            samples.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code >= 500
+
+    async def main():
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(worker(seed, deadline) for seed in range(args.concurrency)))
+
+    asyncio.run(main())
+    return samples, errors
+
+
+def run_mode(args):
+    setup_django(instrument=False)
+    from core.models import Task
+
+    seed_tasks(args.tasks)
+    task_ids = list(Task.objects.values_list('pk', flat=True))
+
+    runner = run_asgi if args.mode == 'asgi' else run_wsgi
+    samples, errors = runner(args, task_ids)
+
+    print(json.dumps({
+        'mode': args.mode,
+        'requests': len(samples),
+        'errors': errors,
+        'rps': len(samples) / args.duration,
+        **percentiles(samples),
+    }))
+
+
+def main():
+    args = parse_args()
+    if args.mode:
+        run_mode(args)
+        return
+
+    print(f"concurrency={args.concurrency} duration={args.duration}s tasks={args.tasks:,} "
+          f"toggles={TOGGLE_RATIO:.0%}\n")
+    for mode in ['wsgi', 'asgi']:
+        env = {**os.environ, 'DJANGO_ASYNC_VIEWS': '1' if mode == 'asgi' else '0'}
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.load_test', *sys.argv[1:], '--mode', mode],
+            cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode.upper():<5} {result['rps']:8.1f} req/s   "
+              f"p50 {result['p50']:7.2f} ms   p95 {result['p95']:7.2f} ms   "
+              f"p99 {result['p99']:7.2f} ms   max {result['max']:8.2f} ms   "
+              f"errors {result['errors']}/{result['requests']}")
+
+
+if __name__ == '__main__':
+    main()
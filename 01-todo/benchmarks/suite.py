@@ -0,0 +1,174 @@
+"""
+End-to-end benchmark suite for the todo views.
+
+For each table size, drives the list, search, create, toggle (with and
+without X-Fragment) and delete views through the test client and records
+p50/p95/p99 latency, SQL queries per request (including writes run on the
+writer thread) and the process's peak RSS. Results can be written as JSON
+and compared against an earlier run, e.g. one taken on the previous commit:
+
+    python -m benchmarks.suite --sizes 10000 100000 --json before.json
+    python -m benchmarks.suite --sizes 10000 100000 --compare before.json
+"""
+import argparse
+import json
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+
+from .common import BASE_DIR, grow_to, percentiles, setup_django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--iterations', type=int, default=50, help='requests per scenario (at most 490)')
+    parser.add_argument('--json', metavar='PATH', help='write results to PATH')
+    parser.add_argument('--compare', metavar='PATH', help='print deltas against an earlier --json file')
+    return parser.parse_args()
+
+
+class QueryCounter:
+    """Counts queries on every connection, whichever thread opened it."""
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self.lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, sender, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_scenarios(client, rng):
+    """Scenario name -> zero-argument callable issuing one request."""
+    from django.core.cache import cache
+    from django.urls import reverse
+    from core.models import Task
+    from core.pagination import encode_cursor
+    from core.views import TaskListView
+
+    list_url = reverse('task_list')
+    newest_pending = Task.objects.pending().order_by('-created_at', '-id')
+    page_2 = {'pending_after': encode_cursor(newest_pending[TaskListView.page_size - 1])}
+    pending_ids = list(newest_pending.values_list('pk', flat=True)[:1000])
+    toggle_ids, delete_ids = pending_ids[:500], pending_ids[500:]
+    etag = client.get(list_url)['ETag']
+
+    def list_cold():
+        cache.clear()
+        client.get(list_url)
+
+    # Reads run first, so the ETag is still current for the 304 scenario.
+    return {
+        'list (cold cache)': list_cold,
+        'list (warm cache)': lambda: client.get(list_url),
+        'list (304)': lambda: client.get(list_url, headers={'if_none_match': etag}),
+        'list (page 2)': lambda: client.get(list_url, page_2),
+        'search': lambda: client.get(reverse('task_search'), {'q': rng.choice(['meeting', 'passport friday'])}),
+        'create': lambda: client.post(reverse('task_create'), {'title': 'Benchmark task', 'priority': 'medium'}),
+        'toggle': lambda: client.post(reverse('task_toggle', args=[rng.choice(toggle_ids)])),
+        'toggle (fragment)': lambda: client.post(
+            reverse('task_toggle', args=[rng.choice(toggle_ids)]), headers={'x_fragment': 'json'}
+        ),
+        'delete': lambda: client.post(reverse('task_delete', args=[delete_ids.pop()])),
+    }
+
+
+def run_scenario(func, counter, iterations, warmup=3):
+    for _ in range(warmup):
+        func()
+
+    samples, queries = [], []
+    for _ in range(iterations):
+        before = counter.count
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count - before)
+
+    return {
+        **percentiles(samples),
+        'queries': sum(queries) / len(queries),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def print_result(name, size, result, baseline=None):
+    line = (f"{name:<20} {size:>10,} rows   p50 {result['p50']:8.2f} ms   p95 {result['p95']:8.2f} ms   "
+            f"p99 {result['p99']:8.2f} ms   {result['queries']:5.1f} q/req   RSS {result['peak_rss_mb']:6.0f} MB")
+    if baseline:
+        change = (result['p50'] - baseline['p50']) / baseline['p50'] * 100
+        line += f"   p50 {change:+6.1f}% vs {baseline['p50']:.2f} ms"
+    print(line)
+
+
+def main():
+    args = parse_args()
+    setup_django(instrument=False)
+
+    import django
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from django.test import Client
+
+    counter = QueryCounter()
+    connection_created.connect(counter.install)
+    connections.close_all()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(r['scenario'], r['size']): r for r in json.load(f)['results']}
+
+    client = Client()
+    rng = random.Random(0)
+    results = []
+    for size in args.sizes:
+        grow_to(size)
+        for name, func in build_scenarios(client, rng).items():
+            result = run_scenario(func, counter, args.iterations)
+            print_result(name, size, result, baseline.get((name, size)))
+            results.append({'scenario': name, 'size': size, **result})
+        print()
+
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'iterations': args.iterations,
+            'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Wrote {args.json}')
+
+
+if __name__ == '__main__':
+    main()
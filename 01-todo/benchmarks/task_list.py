@@ -0,0 +1,50 @@
+"""
+Task list latency as the table grows.
+
+Times the first page and a page several cursors deep for each table size, and
+times the list query on its own so it can be compared with the count query.
+
+    python -m benchmarks.task_list [sizes...]   # default: 10000 100000 1000000
+"""
+from .common import grow_to, measure, parse_sizes, print_row, setup_django
+
+DEEP_PAGES = 10
+
+
+def main():
+    setup_django()
+
+    from django.test import Client
+    from django.urls import reverse
+    from core.views import TaskListView
+
+    client = Client()
+    url = reverse('task_list')
+
+    def deep_page_params():
+        params = {}
+        for _ in range(DEEP_PAGES):
+            response = client.get(url, params)
+            params['pending_after'] = response.context['pending_next_cursor']
+            params['completed_after'] = response.context['completed_next_cursor']
+        return params
+
+    def list_query(params):
+        view = TaskListView()
+        view.request = client.get(url, params).wsgi_request
+        return lambda: list(view.get_queryset())
+
+    for size in parse_sizes([10_000, 100_000, 1_000_000]):
+        grow_to(size)
+        deep = deep_page_params()
+
+        print_row('GET / (first page)', size, measure(lambda: client.get(url)))
+        print_row(f'GET / (page {DEEP_PAGES + 1})', size, measure(lambda: client.get(url, deep)))
+        print_row('list query (first page)', size, measure(list_query({})))
+        print_row(f'list query (page {DEEP_PAGES + 1})', size, measure(list_query(deep)))
+        print_row('count query', size, measure(TaskListView().get_section_counts))
+        print()
+
+
+if __name__ == '__main__':
+    main()
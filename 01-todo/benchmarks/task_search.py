@@ -0,0 +1,44 @@
+"""
+Full-text search (FTS5 + bm25) against a naive icontains filter.
+
+For each table size, times one page of results for a common word, a rare
+word pair and a word that matches nothing.
+
+    python -m benchmarks.task_search [sizes...]   # default: 100000 1000000
+"""
+from .common import grow_to, measure, parse_sizes, print_row, setup_django
+
+PAGE_SIZE = 20
+QUERIES = {
+    'common word': 'meeting',
+    'two words': 'passport friday',
+    'no match': 'zebra',
+}
+
+
+def main():
+    setup_django()
+
+    from django.db.models import Q
+    from core.models import Task
+    from core.search import search_tasks
+
+    def icontains(text):
+        queryset = Task.objects.all()
+        for word in text.split():
+            queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+        return lambda: list(queryset[:PAGE_SIZE])
+
+    def fts(text):
+        return lambda: search_tasks(text, page_size=PAGE_SIZE)
+
+    for size in parse_sizes([100_000, 1_000_000]):
+        grow_to(size)
+        for label, text in QUERIES.items():
+            print_row(f'icontains: {label}', size, measure(icontains(text), iterations=10))
+            print_row(f'fts5/bm25: {label}', size, measure(fts(text), iterations=10))
+        print()
+
+
+if __name__ == '__main__':
+    main()
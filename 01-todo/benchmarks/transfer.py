@@ -0,0 +1,60 @@
+"""
+Export and import throughput, in rows per second.
+
+For each table size, streams the whole table to a temporary file through the
+export view (NDJSON and CSV), then re-imports each file into an emptied
+table with the import command's code path. Peak RSS growth during export
+shows whether memory stays flat.
+
+    python -m benchmarks.transfer [sizes...]   # default: 100000 300000
+"""
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from .common import grow_to, parse_sizes, setup_django
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    setup_django(instrument=False)
+
+    from django.test import Client
+    from django.urls import reverse
+    from core.models import Task
+    from core.transfer import FORMATS, import_tasks, read_csv, read_ndjson
+
+    client = Client()
+    readers = {'ndjson': read_ndjson, 'csv': read_csv}
+    tmpdir = Path(tempfile.mkdtemp(prefix='todo-transfer-'))
+
+    for size in parse_sizes([100_000, 300_000]):
+        for format in FORMATS:
+            grow_to(size)
+            path = tmpdir / f'tasks.{format}'
+
+            rss_before = peak_rss_mb()
+            start = time.perf_counter()
+            response = client.get(reverse('task_export'), {'format': format})
+            with open(path, 'wb') as out:
+                for chunk in response.streaming_content:
+                    out.write(chunk)
+            elapsed = time.perf_counter() - start
+            print(f'export {format:<7} {size:>10,} rows   {size / elapsed:>10,.0f} rows/s   '
+                  f'{path.stat().st_size / 2**20:8.1f} MB   peak RSS +{peak_rss_mb() - rss_before:.1f} MB')
+
+            Task.objects.all().delete()
+            start = time.perf_counter()
+            with open(path, newline='', encoding='utf-8') as source:
+                imported = import_tasks(readers[format](source))
+            elapsed = time.perf_counter() - start
+            print(f'import {format:<7} {imported:>10,} rows   {imported / elapsed:>10,.0f} rows/s')
+        print()
+
+
+if __name__ == '__main__':
+    main()
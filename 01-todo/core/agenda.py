@@ -0,0 +1,53 @@
+"""
+Due-date agenda: pending tasks that are overdue, due today or due this week.
+
+Every query here is a range over due_date on pending tasks, which the
+partial index task_pending_due_idx (due_date WHERE completed IN (0)) serves
+without touching completed rows or tasks with no due date.
+"""
+from django.db import connection
+from django.utils import timezone
+
+from .models import Task
+
+BUCKETS = ['overdue', 'today', 'week']
+BUCKET_LABELS = {
+    'overdue': ('Overdue', 'Nothing overdue.'),
+    'today': ('Due Today', 'Nothing else due today.'),
+    'week': ('Due This Week', 'Nothing due in the next seven days.'),
+}
+
+
+def bucket_bounds(now=None):
+    """Bucket name -> (start, end) due_date range; start is None for overdue."""
+    now = now or timezone.now()
+    tomorrow = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0) + timezone.timedelta(days=1)
+    return {
+        'overdue': (None, now),
+        'today': (now, tomorrow),
+        'week': (tomorrow, tomorrow + timezone.timedelta(days=6)),
+    }
+
+
+def bucket_queryset(bucket, bounds):
+    start, end = bounds[bucket]
+    queryset = Task.objects.pending().filter(due_date__lt=end)
+    if start is not None:
+        queryset = queryset.filter(due_date__gte=start)
+    return queryset.order_by('due_date', 'id')
+
+
+def get_bucket_counts(bounds):
+    """
+    Count every bucket in one query. Each bucket is a scalar COUNT subquery,
+    which SQLite answers by counting an index range; a GROUP BY over a CASE
+    on due_date would evaluate the CASE per row and sort the whole range.
+    """
+    parts, params = [], []
+    for bucket in BUCKETS:
+        sql, bucket_params = bucket_queryset(bucket, bounds).order_by().values('pk').query.sql_with_params()
+        parts.append(f'(SELECT COUNT(*) FROM ({sql}))')
+        params.extend(bucket_params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {', '.join(parts)}", params)
+        return dict(zip(BUCKETS, cursor.fetchone()))
@@ -0,0 +1,68 @@
+"""
+Move long-completed tasks from core_task into core_archivedtask.
+
+Tasks completed (last updated) more than N days ago are copied and deleted
+in batches, one transaction per batch on the writer thread, so the live
+table and its indexes stay proportional to tasks in use rather than to
+everything ever done. Each batch is an INSERT ... SELECT plus a DELETE
+keyed on the same ids; the search index follows through its triggers.
+"""
+from django.db import connection
+from django.utils import timezone
+
+from .caching import invalidate_task_list
+from .models import ArchivedTask, Task, TaskListState
+from .writer import run_write
+
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_BATCH_SIZE = 1000
+
+ARCHIVE_COLUMNS = {
+    # core_archivedtask column: core_task expression
+    'task_id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'priority': 'priority',
+    'due_date': 'due_date',
+    'created_at': 'created_at',
+    'completed_at': 'updated_at',
+}
+
+
+def archivable(cutoff):
+    """Completed tasks last touched before `cutoff`, oldest first."""
+    return Task.objects.done().filter(updated_at__lt=cutoff).order_by('updated_at')
+
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """Archive up to `batch_size` tasks; returns how many were moved."""
+    ids = list(archivable(cutoff).values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0
+
+    now = timezone.now()
+    placeholders = ', '.join(['%s'] * len(ids))
+    columns = ', '.join(ARCHIVE_COLUMNS)
+    expressions = ', '.join(ARCHIVE_COLUMNS.values())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {ArchivedTask._meta.db_table} ({columns}, archived_at) '
+            f'SELECT {expressions}, %s FROM {Task._meta.db_table} WHERE id IN ({placeholders})',
+            [connection.ops.adapt_datetimefield_value(now), *ids],
+        )
+        cursor.execute(f'DELETE FROM {Task._meta.db_table} WHERE id IN ({placeholders})', ids)
+        deleted = cursor.rowcount
+    # A raw DELETE sends no post_delete; record it once for the whole batch.
+    TaskListState.objects.record_deletion(now)
+    return deleted
+
+
+def archive_completed(days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """Archive every task completed more than `days` days ago; returns the total."""
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    total = 0
+    while moved := run_write(archive_batch, cutoff, batch_size):
+        total += moved
+    if total:
+        invalidate_task_list()
+    return total
@@ -0,0 +1,16 @@
+from django.urls import path
+from . import async_views, views
+
+urlpatterns = [
+    path('', async_views.task_list, name='task_list'),
+    path('task/create/', async_views.task_create, name='task_create'),
+    path('task/<int:pk>/toggle/', async_views.task_toggle, name='task_toggle'),
+    path('task/<int:pk>/delete/', async_views.task_delete, name='task_delete'),
+    path('task/bulk/', views.task_bulk, name='task_bulk'),
+    path('agenda/', views.agenda, name='agenda'),
+    path('agenda/<slug:bucket>/', views.agenda_bucket, name='agenda_bucket'),
+    path('archive/', views.task_archive, name='task_archive'),
+    path('task/export/', async_views.task_export, name='task_export'),
+    path('search/', views.task_search, name='task_search'),
+    path('metrics/', views.request_metrics, name='request_metrics'),
+]
@@ -0,0 +1,70 @@
+"""
+Async counterparts of the views in views.py, served when the app runs under
+ASGI (see ai_zoomcamp/urls.py). Reads use Django's async ORM so requests
+don't each occupy a thread while waiting on the database; writes are awaited
+on the single writer thread (see writer.py).
+"""
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+
+from .conditional import aget_list_validators, not_modified_response, set_validators
+from .forms import TaskForm
+from .fragments import form_errors_response, get_fragment_format, task_fragment_response
+from .models import Task
+from .transfer import CONTENT_TYPES, FORMATS, aexport_tasks
+from .views import TaskListView, asection_counts, toggle_task
+from .writer import arun_write
+
+
+async def task_list(request):
+    etag, last_modified = await aget_list_validators(request)
+    response = not_modified_response(request, etag, last_modified)
+    if response is None:
+        view = TaskListView()
+        view.setup(request)
+        view.object_list = view.get_queryset()
+        context = await view.aget_context_data()
+        response = render(request, view.template_name, context)
+    return set_validators(response, etag, last_modified)
+
+
+async def task_create(request):
+    if request.method == 'POST':
+        form = TaskForm(request.POST)
+        format = get_fragment_format(request)
+        if form.is_valid():
+            task = await arun_write(form.save)
+            if format:
+                return task_fragment_response(request, format, task.pk, await asection_counts(), task)
+            return redirect('task_list')
+        if format:
+            return form_errors_response(form)
+    else:
+        form = TaskForm()
+    return render(request, 'core/task_form.html', {'form': form})
+
+
+async def task_export(request):
+    format = request.GET.get('format', 'ndjson')
+    if format not in FORMATS:
+        return JsonResponse({'errors': {'format': f"Expected one of {FORMATS}."}}, status=400)
+    response = StreamingHttpResponse(aexport_tasks(format), content_type=CONTENT_TYPES[format])
+    response['Content-Disposition'] = f'attachment; filename="tasks.{format}"'
+    return response
+
+
+async def task_toggle(request, pk):
+    task = await arun_write(toggle_task, pk)
+    format = get_fragment_format(request)
+    if format:
+        return task_fragment_response(request, format, task.pk, await asection_counts(), task)
+    return redirect('task_list')
+
+
+async def task_delete(request, pk):
+    task = await aget_object_or_404(Task, pk=pk)
+    await arun_write(task.delete)
+    format = get_fragment_format(request)
+    if format:
+        return task_fragment_response(request, format, pk, await asection_counts())
+    return redirect('task_list')
@@ -0,0 +1,141 @@
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import invalidate_task_list
+from .forms import TaskForm
+from .models import Task, TaskListState
+
+OPERATIONS = ['create', 'toggle', 'set_priority', 'delete']
+
+
+class BulkOperationError(Exception):
+    """Raised when a bulk request is malformed; nothing has been written."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _is_id(value):
+    # JSON true/false decode to bool, which is an int subclass.
+    return type(value) is int
+
+
+def _parse_ids(operation, index):
+    ids = operation.get('ids')
+    if not isinstance(ids, list) or not all(_is_id(pk) for pk in ids):
+        raise BulkOperationError({index: "'ids' must be a list of integers."})
+    return ids
+
+
+def _parse_create(operation, index):
+    items = operation.get('tasks')
+    if not isinstance(items, list):
+        raise BulkOperationError({index: "'tasks' must be a list of objects."})
+
+    # Omitted fields fall back to the model defaults, as in Task.objects.create().
+    defaults = {'priority': Task._meta.get_field('priority').default}
+    tasks, errors = [], {}
+    for position, item in enumerate(items):
+        form = TaskForm(data={**defaults, **item} if isinstance(item, dict) else {})
+        if form.is_valid():
+            tasks.append(form.save(commit=False))
+        else:
+            errors[position] = form.errors.get_json_data()
+    if errors:
+        raise BulkOperationError({index: errors})
+    return tasks
+
+
+def _parse_set_priority(operation, index):
+    items = operation.get('tasks')
+    if not isinstance(items, list):
+        raise BulkOperationError({index: "'tasks' must be a list of objects."})
+
+    priorities = dict(Task.PRIORITY_CHOICES)
+    tasks = []
+    for item in items:
+        if (
+            not isinstance(item, dict)
+            or not _is_id(item.get('id'))
+            or item.get('priority') not in priorities
+        ):
+            raise BulkOperationError({
+                index: f"Each task needs an integer 'id' and a 'priority' in {list(priorities)}."
+            })
+        tasks.append(Task(pk=item['id'], priority=item['priority']))
+    return tasks
+
+
+def _delete_ids(ids):
+    # A raw DELETE, as in archive.archive_batch(): QuerySet.delete() would
+    # fetch the rows and send post_delete for each of them.
+    if not ids:
+        return 0
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {Task._meta.db_table} WHERE id IN ({placeholders})', ids)
+        return cursor.rowcount
+
+
+PARSERS = {
+    'create': _parse_create,
+    'toggle': _parse_ids,
+    'set_priority': _parse_set_priority,
+    'delete': _parse_ids,
+}
+
+
+def parse_operations(operations):
+    """Validate every operation up front so a bad entry writes nothing."""
+    if not isinstance(operations, list):
+        raise BulkOperationError({'operations': "Expected a list of operations."})
+
+    parsed = []
+    for index, operation in enumerate(operations):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        if op not in PARSERS:
+            raise BulkOperationError({index: f"'op' must be one of {OPERATIONS}."})
+        parsed.append((op, PARSERS[op](operation, index)))
+    return parsed
+
+
+@transaction.atomic
+def apply_operations(operations):
+    """
+    Apply a list of task operations in one transaction.
+
+    Each operation is a single set-based statement regardless of how many
+    tasks it touches: bulk_create for creates, UPDATE ... SET completed =
+    NOT completed for toggles, bulk_update for priorities and one DELETE.
+    Operations run in the order given. None of them send post_save or
+    post_delete (a signalled delete would fetch the rows and record each
+    deletion separately), so the deletion and the cache invalidation are
+    recorded here once.
+    """
+    parsed = parse_operations(operations)
+    now = timezone.now()
+    result = {'created': [], 'toggled': 0, 'updated': 0, 'deleted': 0}
+
+    for op, payload in parsed:
+        if op == 'create':
+            created = Task.objects.bulk_create(payload)
+            result['created'].extend(task.pk for task in created)
+        elif op == 'toggle':
+            result['toggled'] += Task.objects.filter(pk__in=payload).update(
+                completed=~Q(completed=True),
+                updated_at=now,
+            )
+        elif op == 'set_priority':
+            for task in payload:
+                task.updated_at = now
+            result['updated'] += Task.objects.bulk_update(payload, ['priority', 'updated_at'])
+        elif op == 'delete':
+            deleted = _delete_ids(payload)
+            if deleted:
+                TaskListState.objects.record_deletion(now)
+            result['deleted'] += deleted
+
+    invalidate_task_list()
+    return result
@@ -0,0 +1,59 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+LIST_VERSION_KEY = 'tasks:list_version'
+FRAGMENT_TIMEOUT = 60 * 60
+
+# Rendered fragments are shared between users, so they are cached with this
+# placeholder in place of the CSRF token and the real token is substituted
+# on the way out.
+CSRF_PLACEHOLDER = 'CSRF-TOKEN-PLACEHOLDER'
+
+
+def get_list_version():
+    """Current version of the task list; part of every fragment key."""
+    version = cache.get(LIST_VERSION_KEY)
+    if version is None:
+        # Seed from the clock rather than 1 so that a version evicted from the
+        # cache never comes back to match fragments rendered before eviction.
+        cache.add(LIST_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(LIST_VERSION_KEY)
+    return version
+
+
+async def aget_list_version():
+    """Async counterpart of get_list_version()."""
+    version = await cache.aget(LIST_VERSION_KEY)
+    if version is None:
+        await cache.aadd(LIST_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(LIST_VERSION_KEY)
+    return version
+
+
+def bump_list_version():
+    """Invalidate every cached task list fragment."""
+    try:
+        cache.incr(LIST_VERSION_KEY)
+    except ValueError:
+        cache.add(LIST_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_task_list():
+    """
+    Invalidate cached fragments after a write to Task.
+
+    Bumps right away so this process stops serving stale fragments, and again
+    after commit so a concurrent reader can't have cached the pre-commit
+    state under the new version.
+    """
+    bump_list_version()
+    transaction.on_commit(bump_list_version)
+
+
+def fragment_key(name, version, query):
+    """Cache key for one rendered list section at a list version and page."""
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    return f'tasks:fragment:{name}:{version}:{digest}'
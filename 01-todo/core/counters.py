@@ -0,0 +1,79 @@
+"""
+Denormalized task counts.
+
+core_taskcounter holds one row per (priority, completed) with the number of
+tasks in it. Like the search index (search.py), it is maintained by SQLite
+triggers on core_task, so every write path -- ORM saves and deletes, bulk
+queryset updates, the raw INSERTs of import and seeding, archiving's DELETE
+-- adjusts the counters inside the statement that changed the rows, and
+therefore inside the same transaction. There is a single writer (see
+writer.py), so the hot counter rows add no lock contention.
+
+Counts are then read from at most six rows whatever the table size.
+reconcile_counters() recomputes them from core_task and reports any drift.
+"""
+from django.db import connection, transaction
+from django.db.models import Count
+
+from .caching import invalidate_task_list
+from .models import Task, TaskCounter
+
+COUNTER_TABLE = 'core_taskcounter'
+
+# Keep in sync with migration 0008_task_counter. SQLite drops triggers when
+# Django rebuilds core_task during a schema change, so `reconcile_counters`
+# recreates them if they are missing.
+TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_task_counter_insert AFTER INSERT ON core_task BEGIN
+        INSERT INTO {COUNTER_TABLE}(priority, completed, count) VALUES (new.priority, new.completed, 1)
+        ON CONFLICT(priority, completed) DO UPDATE SET count = count + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_task_counter_delete AFTER DELETE ON core_task BEGIN
+        UPDATE {COUNTER_TABLE} SET count = count - 1
+        WHERE priority = old.priority AND completed = old.completed;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_task_counter_update AFTER UPDATE OF priority, completed ON core_task
+    WHEN old.priority IS NOT new.priority OR old.completed IS NOT new.completed BEGIN
+        UPDATE {COUNTER_TABLE} SET count = count - 1
+        WHERE priority = old.priority AND completed = old.completed;
+        INSERT INTO {COUNTER_TABLE}(priority, completed, count) VALUES (new.priority, new.completed, 1)
+        ON CONFLICT(priority, completed) DO UPDATE SET count = count + 1;
+    END
+    """,
+]
+
+
+def reconcile_counters(fix=True):
+    """
+    Recount core_task and compare with the stored counters.
+
+    Returns a list of (priority, completed, stored, actual) for every counter
+    that was wrong; with fix=True they are corrected and missing triggers
+    recreated, all in one transaction, and the cached list sections (which
+    embed the counts) are invalidated.
+    """
+    with transaction.atomic():
+        if fix:
+            with connection.cursor() as cursor:
+                for sql in TRIGGERS_SQL:
+                    cursor.execute(sql)
+        rows = Task.objects.order_by().values_list('priority', 'completed').annotate(Count('pk'))
+        actual = {(priority, completed): count for priority, completed, count in rows}
+        rows = TaskCounter.objects.values_list('priority', 'completed', 'count')
+        stored = {(priority, completed): count for priority, completed, count in rows}
+        drift = [
+            (*key, stored.get(key, 0), actual.get(key, 0))
+            for key in sorted(actual.keys() | stored.keys())
+            if stored.get(key, 0) != actual.get(key, 0)
+        ]
+        if fix:
+            for priority, completed, _, count in drift:
+                TaskCounter.objects.update_or_create(priority=priority, completed=completed, defaults={'count': count})
+    if fix and drift:
+        invalidate_task_list()
+    return drift
@@ -0,0 +1,46 @@
+"""
+Fragment responses for single-task writes.
+
+Toggle, create and delete normally redirect to the task list, which costs a
+second request that re-runs the list queries and re-renders home.html. When
+the request carries an `X-Fragment: html` or `X-Fragment: json` header
+(sent by the script in base.html), the view instead answers with just the
+changed row and the new section counts, and the page swaps them in place.
+"""
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+
+FRAGMENT_HEADER = 'X-Fragment'
+FRAGMENT_FORMATS = ['html', 'json']
+
+
+def get_fragment_format(request):
+    """'html' or 'json' if the request asked for a fragment, else None."""
+    value = request.headers.get(FRAGMENT_HEADER, '').lower()
+    return value if value in FRAGMENT_FORMATS else None
+
+
+def task_fragment_response(request, format, task_id, counts, task=None):
+    """
+    The changed row (empty once deleted) plus the section counts.
+
+    HTML fragments carry the counts and the row's target section in
+    X-Task-* headers; JSON puts everything in the body.
+    """
+    html = render_to_string('core/task_item.html', {'task': task}, request=request) if task else ''
+    section = None if task is None else 'completed' if task.completed else 'pending'
+
+    if format == 'json':
+        return JsonResponse({'id': task_id, 'section': section, 'html': html, 'counts': counts})
+
+    response = HttpResponse(html)
+    response['X-Task-Id'] = task_id
+    if section:
+        response['X-Task-Section'] = section
+    for name, count in counts.items():
+        response[f'X-Task-Count-{name.capitalize()}'] = count
+    return response
+
+
+def form_errors_response(form):
+    return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
@@ -0,0 +1,260 @@
+"""
+Per-request timing and SQL instrumentation.
+
+RequestProfilingMiddleware opens a RequestProfile for each request. Every
+query on any connection (including the writer thread, which runs jobs in
+the submitting request's context) and every top-level template render is
+recorded into it. When the response leaves the middleware:
+
+- A Server-Timing header reports SQL, template, view and total time.
+- Queries repeated with different parameters (N+1) and identical queries
+  run more than once are logged.
+- Requests slower than settings.SLOW_REQUEST_MS are logged with their SQL.
+- Per-route latency histograms are updated; request_metrics serves them to
+  staff users.
+
+Metrics live in process memory, so each worker process reports its own.
+"""
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []  # (sql, params, seconds)
+        self.template_time = 0.0
+        self.lock = threading.Lock()
+
+    def add_query(self, sql, params, seconds):
+        with self.lock:
+            self.queries.append((sql, params, seconds))
+
+    def add_template_time(self, seconds):
+        with self.lock:
+            self.template_time += seconds
+
+    @property
+    def sql_time(self):
+        return sum(seconds for _, _, seconds in self.queries)
+
+    def _selects(self):
+        # Writes and transaction control (BEGIN, SAVEPOINT ...) legitimately
+        # repeat; only reads are checked for N+1 and duplicates.
+        return [(sql, repr(params)) for sql, params, _ in self.queries if sql.lstrip()[:6].upper() == 'SELECT']
+
+    def n_plus_one(self, threshold):
+        """SELECTs run at least `threshold` times with differing parameters."""
+        selects = self._selects()
+        variants = {}
+        for sql, params in selects:
+            variants.setdefault(sql, set()).add(params)
+        counts = Counter(sql for sql, _ in selects)
+        return {
+            sql: count for sql, count in counts.items()
+            if count >= threshold and len(variants[sql]) > 1
+        }
+
+    def duplicates(self):
+        """SELECTs run more than once with identical parameters."""
+        counts = Counter(self._selects())
+        return {key: count for key, count in counts.items() if count > 1}
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper that times queries into the current profile."""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, params, time.perf_counter() - start)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver; see CoreConfig.ready()."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class ProfiledTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = _current_profile.get()
+        if profile is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.add_template_time(time.perf_counter() - start)
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """
+    DjangoTemplates whose templates report render time to the request
+    profile. {% include %} renders inside its parent, so only templates
+    loaded through the backend (render(), render_to_string()) are timed and
+    nothing is counted twice.
+    """
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name).template, self)
+
+
+class RouteMetrics:
+    """Latency histograms and query totals per URL route."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, total_ms, queries, sql_ms, n_plus_one, duplicates):
+        with self._lock:
+            stats = self._routes.setdefault(route, {
+                'count': 0,
+                'total_ms': 0.0,
+                'sql_ms': 0.0,
+                'queries': 0,
+                'n_plus_one': 0,
+                'duplicates': 0,
+                'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            })
+            stats['count'] += 1
+            stats['total_ms'] += total_ms
+            stats['sql_ms'] += sql_ms
+            stats['queries'] += queries
+            stats['n_plus_one'] += bool(n_plus_one)
+            stats['duplicates'] += bool(duplicates)
+            stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, total_ms)] += 1
+
+    @staticmethod
+    def _percentile(buckets, count, fraction):
+        # Upper bound of the bucket holding the percentile; None if it falls
+        # in the open-ended bucket.
+        rank, seen = fraction * count, 0
+        for bound, hits in zip(LATENCY_BUCKETS_MS, buckets):
+            seen += hits
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self):
+        with self._lock:
+            routes = {route: {**stats, 'buckets': list(stats['buckets'])} for route, stats in self._routes.items()}
+        return {
+            'bucket_bounds_ms': LATENCY_BUCKETS_MS,
+            'routes': {
+                route: {
+                    'count': stats['count'],
+                    'mean_ms': stats['total_ms'] / stats['count'],
+                    'p50_ms': self._percentile(stats['buckets'], stats['count'], 0.50),
+                    'p95_ms': self._percentile(stats['buckets'], stats['count'], 0.95),
+                    'p99_ms': self._percentile(stats['buckets'], stats['count'], 0.99),
+                    'queries_per_request': stats['queries'] / stats['count'],
+                    'sql_ms_per_request': stats['sql_ms'] / stats['count'],
+                    'n_plus_one_requests': stats['n_plus_one'],
+                    'duplicate_query_requests': stats['duplicates'],
+                    'buckets': stats['buckets'],
+                }
+                for route, stats in sorted(routes.items())
+            },
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+metrics = RouteMetrics()
+
+
+def get_route(request):
+    match = request.resolver_match
+    if match is None:
+        return '<unresolved>'
+    return f'/{match.route}'
+
+
+class RequestProfilingMiddleware:
+    """Must come first in MIDDLEWARE so the timings cover the whole stack."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    def finish(self, request, response, profile):
+        # For streaming responses this covers producing the response object,
+        # not sending its body.
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        sql_ms = profile.sql_time * 1000
+        template_ms = profile.template_time * 1000
+        view_ms = max(total_ms - sql_ms - template_ms, 0.0)
+        route = get_route(request)
+
+        response.headers['Server-Timing'] = ', '.join([
+            f'db;dur={sql_ms:.2f};desc="{len(profile.queries)} queries"',
+            f'tpl;dur={template_ms:.2f}',
+            f'view;dur={view_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+
+        n_plus_one = profile.n_plus_one(settings.N_PLUS_ONE_THRESHOLD)
+        for sql, count in n_plus_one.items():
+            logger.warning('Possible N+1 on %s %s: %d x %s', request.method, route, count, sql)
+        duplicates = profile.duplicates()
+        for (sql, params), count in duplicates.items():
+            logger.warning('Duplicate query on %s %s: %d x %s %s', request.method, route, count, sql, params)
+
+        if total_ms >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                'Slow request %s %s: %.1f ms (%d queries, %.1f ms SQL, %.1f ms templates)\n%s',
+                request.method, request.get_full_path(), total_ms, len(profile.queries), sql_ms, template_ms,
+                '\n'.join(f'  {seconds * 1000:8.2f} ms  {sql}  {params}' for sql, params, seconds in profile.queries),
+            )
+
+        metrics.record(route, total_ms, len(profile.queries), sql_ms, n_plus_one, duplicates)
+        return response
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_completed
+
+
+class Command(BaseCommand):
+    help = 'Move tasks completed more than --days ago into the archive table. Safe to run from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        archived = archive_completed(days=options['days'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived} tasks completed more than {options["days"]} days ago in {elapsed:.2f}s.'
+        ))
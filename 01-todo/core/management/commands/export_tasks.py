@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Task
+from core.transfer import FORMATS, export_tasks, format_for_path
+
+
+class Command(BaseCommand):
+    help = 'Stream every task to a file (or stdout) as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help="Output file, or '-' for stdout.")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the output file extension, else ndjson.')
+
+    def handle(self, *args, **options):
+        path = options['output']
+        format = options['format'] or format_for_path(path)
+
+        rows = Task.objects.count()
+        start = time.perf_counter()
+        if path == '-':
+            for chunk in export_tasks(format):
+                self.stdout.write(chunk, ending='')
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as out:
+                for chunk in export_tasks(format):
+                    out.write(chunk)
+        elapsed = time.perf_counter() - start
+
+        # The report goes to stderr so it never ends up in an exported stream.
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {rows} tasks in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s).'
+        ))
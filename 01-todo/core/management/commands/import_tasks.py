@@ -0,0 +1,37 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.transfer import (
+    FORMATS, IMPORT_BATCH_SIZE, TaskImportError, format_for_path, import_tasks, read_csv, read_ndjson,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from an NDJSON or CSV file (or stdin) in batched transactions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Input file, or '-' for stdin.")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the input file extension, else ndjson.')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['input']
+        format = options['format'] or format_for_path(path)
+        reader = read_csv if format == 'csv' else read_ndjson
+
+        start = time.perf_counter()
+        source = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            imported = import_tasks(reader(source), batch_size=options['batch_size'])
+        except TaskImportError as exc:
+            raise CommandError(f'{exc} Batches before this line were imported.') from exc
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} tasks in {elapsed:.2f}s ({imported / max(elapsed, 1e-9):,.0f} rows/s).'
+        ))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Task
+from core.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over task titles and descriptions.'
+
+    def handle(self, *args, **options):
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index for {Task.objects.count()} tasks.'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.counters import reconcile_counters
+from core.writer import run_write
+
+
+class Command(BaseCommand):
+    help = 'Recount tasks per priority and status, report drift in the stored counters and correct it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift, and exit with an error if there is any. Safe to run from cron.',
+        )
+
+    def handle(self, *args, **options):
+        drift = run_write(reconcile_counters, fix=not options['check'])
+        for priority, completed, stored, actual in drift:
+            status = 'completed' if completed else 'pending'
+            self.stdout.write(f'{priority}/{status}: stored {stored}, actual {actual} ({stored - actual:+d})')
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Task counters match the task table.'))
+        elif options['check']:
+            raise CommandError(f'{len(drift)} task counters have drifted.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Corrected {len(drift)} task counters.'))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.seeding import SEED_BATCH_SIZE, seed_tasks
+
+
+class Command(BaseCommand):
+    help = 'Generate realistic tasks for load testing, inserted in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int)
+        parser.add_argument('--completed-ratio', type=float, default=0.7)
+        parser.add_argument('--days', type=int, default=365, help='Spread creation dates over this many days.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for reproducible data.')
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = seed_tasks(
+            options['count'],
+            batch_size=options['batch_size'],
+            completed_ratio=options['completed_ratio'],
+            days=options['days'],
+            seed=options['seed'],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {count} tasks in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} rows/s).'
+        ))
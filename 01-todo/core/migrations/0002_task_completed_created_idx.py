@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed', '-created_at', '-id'], name='task_completed_created_idx'),
+        ),
+    ]
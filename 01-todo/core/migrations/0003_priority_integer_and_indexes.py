@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:15
+
+import core.models
+from django.db import migrations, models
+
+
+PRIORITY_LEVELS = {
+    'low': '1',
+    'medium': '2',
+    'high': '3',
+}
+
+
+def priority_names_to_levels(apps, schema_editor):
+    # Rewrite the text values as digits so the column type change casts them.
+    Task = apps.get_model('core', 'Task')
+    for name, level in PRIORITY_LEVELS.items():
+        Task.objects.filter(priority=name).update(priority=level)
+
+
+def priority_levels_to_names(apps, schema_editor):
+    Task = apps.get_model('core', 'Task')
+    for name, level in PRIORITY_LEVELS.items():
+        Task.objects.filter(priority=level).update(priority=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_task_completed_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(priority_names_to_levels, priority_levels_to_names),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=core.models.PriorityField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], default='medium'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed', '-priority', 'due_date'], name='task_completed_prio_due_idx'),
+        ),
+    ]
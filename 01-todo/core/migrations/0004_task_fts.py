@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_priority_integer_and_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE VIRTUAL TABLE core_task_fts USING fts5(
+                    title, description,
+                    content='core_task', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+                """,
+                """
+                CREATE TRIGGER core_task_fts_insert AFTER INSERT ON core_task BEGIN
+                    INSERT INTO core_task_fts(rowid, title, description)
+                    VALUES (new.id, new.title, new.description);
+                END
+                """,
+                """
+                CREATE TRIGGER core_task_fts_delete AFTER DELETE ON core_task BEGIN
+                    INSERT INTO core_task_fts(core_task_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                END
+                """,
+                """
+                CREATE TRIGGER core_task_fts_update AFTER UPDATE OF title, description ON core_task BEGIN
+                    INSERT INTO core_task_fts(core_task_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                    INSERT INTO core_task_fts(rowid, title, description)
+                    VALUES (new.id, new.title, new.description);
+                END
+                """,
+                "INSERT INTO core_task_fts(core_task_fts) VALUES ('rebuild')",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS core_task_fts_update",
+                "DROP TRIGGER IF EXISTS core_task_fts_delete",
+                "DROP TRIGGER IF EXISTS core_task_fts_insert",
+                "DROP TABLE IF EXISTS core_task_fts",
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_task_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskListState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('deleted_version', models.PositiveBigIntegerField(default=0)),
+                ('last_deleted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'], name='task_updated_idx'),
+        ),
+    ]
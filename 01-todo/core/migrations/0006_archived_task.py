@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:18
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_task_list_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField(unique=True)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('priority', core.models.PriorityField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], default='medium')),
+                ('due_date', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='archived_created_idx')],
+            },
+        ),
+    ]
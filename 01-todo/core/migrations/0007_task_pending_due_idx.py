@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_archived_task'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('completed__in', [False]), ('due_date__isnull', False)), fields=['completed', 'due_date'], name='task_pending_due_idx'),
+        ),
+    ]
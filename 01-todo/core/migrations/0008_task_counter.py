@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:33
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_task_pending_due_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', core.models.PriorityField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')])),
+                ('completed', models.BooleanField()),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('priority', 'completed'), name='task_counter_unique')],
+            },
+        ),
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE TRIGGER core_task_counter_insert AFTER INSERT ON core_task BEGIN
+                    INSERT INTO core_taskcounter(priority, completed, count) VALUES (new.priority, new.completed, 1)
+                    ON CONFLICT(priority, completed) DO UPDATE SET count = count + 1;
+                END
+                """,
+                """
+                CREATE TRIGGER core_task_counter_delete AFTER DELETE ON core_task BEGIN
+                    UPDATE core_taskcounter SET count = count - 1
+                    WHERE priority = old.priority AND completed = old.completed;
+                END
+                """,
+                """
+                CREATE TRIGGER core_task_counter_update AFTER UPDATE OF priority, completed ON core_task
+                WHEN old.priority IS NOT new.priority OR old.completed IS NOT new.completed BEGIN
+                    UPDATE core_taskcounter SET count = count - 1
+                    WHERE priority = old.priority AND completed = old.completed;
+                    INSERT INTO core_taskcounter(priority, completed, count) VALUES (new.priority, new.completed, 1)
+                    ON CONFLICT(priority, completed) DO UPDATE SET count = count + 1;
+                END
+                """,
+                """
+                INSERT INTO core_taskcounter(priority, completed, count)
+                SELECT priority, completed, COUNT(*) FROM core_task GROUP BY priority, completed
+                """,
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS core_task_counter_update",
+                "DROP TRIGGER IF EXISTS core_task_counter_delete",
+                "DROP TRIGGER IF EXISTS core_task_counter_insert",
+            ],
+        ),
+    ]
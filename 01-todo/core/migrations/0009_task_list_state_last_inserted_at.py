@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_task_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskliststate',
+            name='last_inserted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
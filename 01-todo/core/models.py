@@ -1,6 +1,62 @@
 from django.db import models
 
 
+class PriorityField(models.PositiveSmallIntegerField):
+    """
+    Stores priority as a small integer so it sorts and indexes by urgency,
+    while Python code, forms and templates keep using 'low'/'medium'/'high'.
+    """
+
+    LEVELS = {
+        'low': 1,
+        'medium': 2,
+        'high': 3,
+    }
+    NAMES = {level: name for name, level in LEVELS.items()}
+
+    @property
+    def validators(self):
+        # Values are names, not integers; choices validation covers them.
+        return []
+
+    def from_db_value(self, value, expression, connection):
+        # A level written outside the ORM that has no name is returned as
+        # is rather than making every read of the row fail.
+        return self.NAMES.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int):
+            return self.NAMES.get(value, value)
+        return value
+
+    def get_prep_value(self, value):
+        if value is None or (type(value) is int and value in self.NAMES):
+            return value
+        try:
+            return self.LEVELS[value]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"Field '{self.name}' expected one of {list(self.LEVELS)}, got {value!r}."
+            ) from None
+
+
+class TaskQuerySet(models.QuerySet):
+    def status(self, completed):
+        # A plain completed=<bool> filter renders as `NOT "completed"`, which
+        # SQLite can't seek on; an IN() equality uses the completed-prefixed
+        # indexes below.
+        return self.filter(completed__in=[completed])
+
+    def pending(self):
+        return self.status(False)
+
+    def done(self):
+        return self.status(True)
+
+    def by_urgency(self):
+        return self.order_by('-priority', 'due_date')
+
+
 class Task(models.Model):
     PRIORITY_CHOICES = [
         ('low', 'Low'),
@@ -11,8 +67,7 @@ class Task(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
     completed = models.BooleanField(default=False)
-    priority = models.CharField(
-        max_length=10,
+    priority = PriorityField(
         choices=PRIORITY_CHOICES,
         default='medium'
     )
@@ -20,8 +75,117 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['completed', '-created_at', '-id'], name='task_completed_created_idx'),
+            models.Index(fields=['completed', '-priority', 'due_date'], name='task_completed_prio_due_idx'),
+            models.Index(fields=['updated_at'], name='task_updated_idx'),
+            # Agenda range scans (agenda.py). Only pending, dated tasks are
+            # indexed; the condition matches the IN () form pending() emits.
+            # The constant leading `completed` column is what makes SQLite's
+            # planner prefer this index over the other completed-prefixed
+            # ones when no ANALYZE statistics exist.
+            models.Index(
+                fields=['completed', 'due_date'],
+                condition=models.Q(completed__in=[False], due_date__isnull=False),
+                name='task_pending_due_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class TaskListStateQuerySet(models.QuerySet):
+    def record_deletion(self, when):
+        updated = self.filter(pk=TaskListState.SINGLETON_PK).update(
+            deleted_version=models.F('deleted_version') + 1,
+            last_deleted_at=when,
+        )
+        if not updated:
+            self.create(pk=TaskListState.SINGLETON_PK, deleted_version=1, last_deleted_at=when)
+
+    def record_insert(self, when):
+        updated = self.filter(pk=TaskListState.SINGLETON_PK).update(last_inserted_at=when)
+        if not updated:
+            self.create(pk=TaskListState.SINGLETON_PK, last_inserted_at=when)
+
+    def current(self):
+        return self.filter(pk=TaskListState.SINGLETON_PK).first() or TaskListState()
+
+
+class TaskListState(models.Model):
+    """
+    Single row of list-wide state that can't be read off the remaining tasks:
+    a deleted row leaves no updated_at behind, and imported or seeded rows
+    keep their own, possibly older, updated_at.
+    """
+
+    SINGLETON_PK = 1
+
+    deleted_version = models.PositiveBigIntegerField(default=0)
+    last_deleted_at = models.DateTimeField(blank=True, null=True)
+    last_inserted_at = models.DateTimeField(blank=True, null=True)
+
+    objects = TaskListStateQuerySet.as_manager()
+
+
+class TaskCounterQuerySet(models.QuerySet):
+    def by_status(self):
+        """(completed, count) pairs, shaped like a GROUP BY over core_task."""
+        return self.order_by().values_list('completed').annotate(count=models.Sum('count'))
+
+    def total(self):
+        return self.aggregate(total=models.Sum('count', default=0))['total']
+
+    async def atotal(self):
+        return (await self.aaggregate(total=models.Sum('count', default=0)))['total']
+
+
+class TaskCounter(models.Model):
+    """
+    Number of tasks per (priority, completed), kept current by triggers on
+    core_task (see counters.py), so counts are read from at most six rows
+    instead of scanning the table.
+    """
+
+    priority = PriorityField(choices=Task.PRIORITY_CHOICES)
+    completed = models.BooleanField()
+    count = models.BigIntegerField(default=0)
+
+    objects = TaskCounterQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['priority', 'completed'], name='task_counter_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.priority}/{"completed" if self.completed else "pending"}: {self.count}'
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of core_task by archive.archive_completed(),
+    so the live table and its indexes only hold tasks still in use.
+    """
+
+    task_id = models.BigIntegerField(unique=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, null=True)
+    priority = PriorityField(choices=Task.PRIORITY_CHOICES, default='medium')
+    due_date = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    completed_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='archived_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
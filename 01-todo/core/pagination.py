@@ -0,0 +1,44 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(task, field='created_at'):
+    """Encode the (<field>, id) position of a task as an opaque URL-safe cursor."""
+    raw = f'{getattr(task, field).isoformat()}|{task.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into a (datetime, id) tuple, or None if it is missing or invalid."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+
+def keyset_after(cursor, field='created_at', descending=True):
+    """Filter for rows after the cursor in (<field>, id) order, newest first by default."""
+    value, pk = cursor
+    # The leading inclusive bound lets SQLite range-scan the index.
+    if descending:
+        return Q(**{f'{field}__lte': value}) & (Q(**{f'{field}__lt': value}) | Q(pk__lt=pk))
+    return Q(**{f'{field}__gte': value}) & (Q(**{f'{field}__gt': value}) | Q(pk__gt=pk))
+
+
+def keyset_page(queryset, cursor, page_size, field='created_at', descending=True):
+    """
+    Return (page, next_cursor) for the rows of an already ordered queryset
+    that come after `cursor` (a decoded cursor, or None for the first page).
+    """
+    if cursor is not None:
+        queryset = queryset.filter(keyset_after(cursor, field, descending))
+    rows = list(queryset[:page_size + 1])
+    page = rows[:page_size]
+    return page, encode_cursor(page[-1], field) if len(rows) > page_size else None
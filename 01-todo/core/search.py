@@ -0,0 +1,90 @@
+import re
+
+from django.db import connection
+
+from .models import Task
+
+FTS_TABLE = 'core_task_fts'
+
+# Title matches count for more than description matches in bm25 ranking.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Keep in sync with migration 0004_task_fts. SQLite drops triggers when Django
+# rebuilds core_task during a schema change, so `rebuild_task_search` recreates
+# them if they are missing.
+TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_task_fts_insert AFTER INSERT ON core_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_task_fts_delete AFTER DELETE ON core_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_task_fts_update AFTER UPDATE OF title, description ON core_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+TERM_RE = re.compile(r'\w+')
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word must match and the last one also matches as a prefix, so the
+    box can be used as you type. Words are quoted, so FTS5 operators and
+    punctuation in user input are treated as plain text.
+    """
+    terms = TERM_RE.findall(text)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_tasks(text, page=1, page_size=20):
+    """
+    Rank tasks matching `text` with bm25 and return one page of them.
+
+    Returns a (tasks, has_next) tuple; tasks are in rank order.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return [], False
+
+    offset = (page - 1) * page_size
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT rowid FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY bm25({FTS_TABLE}, %s, %s)
+            LIMIT %s OFFSET %s
+            """,
+            [match, TITLE_WEIGHT, DESCRIPTION_WEIGHT, page_size + 1, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    tasks = Task.objects.in_bulk(ids[:page_size])
+    return [tasks[pk] for pk in ids[:page_size] if pk in tasks], len(ids) > page_size
+
+
+def rebuild_search_index():
+    """Recreate missing sync triggers and rebuild the index from core_task."""
+    with connection.cursor() as cursor:
+        for sql in TRIGGERS_SQL:
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
@@ -0,0 +1,74 @@
+"""
+Synthetic but realistic task data for load testing and benchmarks.
+
+Rows are generated as plain tuples and written with transfer.insert_rows(),
+so millions of tasks can be seeded without building a model instance each.
+"""
+import random
+
+from django.utils import timezone
+
+from .caching import invalidate_task_list
+from .models import PriorityField
+from .transfer import insert_rows
+
+SEED_BATCH_SIZE = 10_000
+PRIORITY_WEIGHTS = {'low': 3, 'medium': 5, 'high': 2}
+WORDS = (
+    'buy call email write review fix plan book clean pay update prepare send '
+    'schedule organize read finish check order renew cancel draft submit test '
+    'groceries report invoice dentist meeting budget garden car kitchen project '
+    'presentation taxes insurance passport laundry birthday flight hotel doctor '
+    'contract website backup newsletter proposal client team manager quarterly '
+    'weekly monthly urgent tomorrow morning evening friday deadline notes slides'
+).split()
+
+
+def generate_rows(count, completed_ratio=0.7, days=365, seed=0, now=None):
+    """
+    Yield `count` task rows in transfer.FIELDS order.
+
+    Tasks are created at a steady rate over the last `days` days, oldest
+    first. About `completed_ratio` of them are completed, half have a
+    description and 60% have a due date between a month ago and two months
+    from now.
+    """
+    rng = random.Random(seed)
+    now = now or timezone.now()
+    start = now - timezone.timedelta(days=days)
+    step = timezone.timedelta(days=days) / max(count, 1)
+    priorities = [PriorityField.LEVELS[name] for name in PRIORITY_WEIGHTS]
+    weights = list(PRIORITY_WEIGHTS.values())
+
+    for i in range(count):
+        created_at = start + step * i
+        completed = rng.random() < completed_ratio
+        due_date = None
+        if rng.random() < 0.6:
+            due_date = now + timezone.timedelta(hours=rng.randint(-30 * 24, 60 * 24))
+        updated_at = created_at
+        if completed:
+            updated_at = min(created_at + timezone.timedelta(minutes=rng.randint(5, 14 * 24 * 60)), now)
+        yield (
+            ' '.join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+            ' '.join(rng.choices(WORDS, k=rng.randint(5, 20))) if rng.random() < 0.5 else None,
+            completed,
+            rng.choices(priorities, weights)[0],
+            due_date,
+            created_at,
+            updated_at,
+        )
+
+
+def seed_tasks(count, batch_size=SEED_BATCH_SIZE, **options):
+    """Insert `count` generated tasks, batch_size per transaction."""
+    batch = []
+    for row in generate_rows(count, **options):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            insert_rows(batch)
+            batch = []
+    if batch:
+        insert_rows(batch)
+    invalidate_task_list()
+    return count
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import invalidate_task_list
+from .models import Task, TaskListState
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, **kwargs):
+    invalidate_task_list()
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, **kwargs):
+    TaskListState.objects.record_deletion(timezone.now())
@@ -1,7 +1,37 @@
-from django.test import TestCase
-from django.urls import reverse
+import csv
+import json
+import tempfile
+import threading
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
 from django.utils import timezone
-from .models import Task
+from . import async_views
+from .agenda import BUCKETS, bucket_bounds, bucket_queryset, get_bucket_counts
+from .archive import archive_completed
+from .bulk import apply_operations
+from .caching import CSRF_PLACEHOLDER, get_list_version
+from .conditional import get_list_validators
+from .counters import reconcile_counters
+from .instrumentation import RequestProfile, RequestProfilingMiddleware, metrics
+from .models import ArchivedTask, Task, TaskCounter, TaskListState
+from .search import build_match_query, search_tasks
+from .seeding import generate_rows, seed_tasks
+from .transfer import FIELDS, FORMATS, TaskImportError, export_tasks, import_tasks, read_ndjson
+from .views import TaskListView
+from .writer import run_write, writer
 
 
 class TaskModelTests(TestCase):
@@ -161,6 +191,1440 @@ class TaskViewTests(TestCase):
         self.assertEqual(Task.objects.count(), task_count_before)
 
 
+class TaskListPaginationTests(TestCase):
+    """Test cases for keyset pagination of the task list"""
+
+    def setUp(self):
+        """Create more pending tasks than fit on one page"""
+        self.page_size = 20
+        self.pending = [Task.objects.create(title=f"Pending {i}") for i in range(25)]
+        self.completed = [Task.objects.create(title=f"Completed {i}", completed=True) for i in range(3)]
+
+    def test_task_list_runs_bounded_queries(self):
+        """Test that the list page is served by three validator, one list and one count query"""
+        with self.assertNumQueries(5):
+            self.client.get(reverse('task_list'))
+
+    def test_first_page_is_limited(self):
+        """Test that the first page shows only the newest page_size tasks"""
+        response = self.client.get(reverse('task_list'))
+        pending = response.context['pending_tasks']
+        self.assertEqual(len(pending), self.page_size)
+        self.assertEqual(pending[0], self.pending[-1])
+        self.assertIsNotNone(response.context['pending_next_cursor'])
+        self.assertIsNone(response.context['completed_next_cursor'])
+        self.assertEqual(response.context['pending_count'], 25)
+        self.assertEqual(response.context['completed_count'], 3)
+
+    def test_next_page_continues_after_cursor(self):
+        """Test that following the cursor returns the remaining tasks without overlap"""
+        first = self.client.get(reverse('task_list'))
+        cursor = first.context['pending_next_cursor']
+        second = self.client.get(reverse('task_list'), {'pending_after': cursor})
+
+        seen = list(first.context['pending_tasks']) + list(second.context['pending_tasks'])
+        self.assertEqual(len(second.context['pending_tasks']), 5)
+        self.assertIsNone(second.context['pending_next_cursor'])
+        self.assertEqual(seen, list(reversed(self.pending)))
+        self.assertEqual(len(second.context['completed_tasks']), 3)
+
+    def test_cursor_orders_ties_by_id(self):
+        """Test that tasks sharing created_at are paginated by id"""
+        Task.objects.update(created_at=timezone.now())
+        first = self.client.get(reverse('task_list'))
+        second = self.client.get(reverse('task_list'), {
+            'pending_after': first.context['pending_next_cursor']
+        })
+        seen = list(first.context['pending_tasks']) + list(second.context['pending_tasks'])
+        self.assertEqual([t.pk for t in seen], sorted((t.pk for t in self.pending), reverse=True))
+
+    def test_invalid_cursor_shows_first_page(self):
+        """Test that a malformed cursor falls back to the first page"""
+        response = self.client.get(reverse('task_list'), {'pending_after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['pending_tasks'][0], self.pending[-1])
+
+    def test_next_link_rendered(self):
+        """Test that the page links to the next pending page"""
+        response = self.client.get(reverse('task_list'))
+        self.assertContains(response, 'pending_after=')
+        self.assertContains(response, 'Older')
+
+    def test_cached_links_ignore_other_params(self):
+        """Test that unrelated query params don't end up in the shared cached sections"""
+        cache.clear()
+        response = self.client.get(reverse('task_list'), {'utm': 'attacker"'})
+        self.assertContains(response, 'pending_after=')
+        self.assertNotContains(response, 'utm=')
+        response = Client().get(reverse('task_list'))
+        self.assertNotContains(response, 'utm=')
+        self.assertNotContains(response, 'attacker')
+
+    def test_links_keep_other_section_cursor(self):
+        """Test that paging one section keeps the other section's position"""
+        cursor = self.client.get(reverse('task_list')).context['pending_next_cursor']
+        response = self.client.get(reverse('task_list'), {'pending_after': cursor, 'completed_after': cursor})
+        # The pending "Newest" link drops pending_after but keeps completed_after.
+        self.assertIn(f'href="?{urlencode({"completed_after": cursor})}"', response.context['pending_section'])
+
+
+class TaskPriorityTests(TestCase):
+    """Test cases for the integer-backed priority field"""
+
+    def test_priority_stored_as_integer(self):
+        """Test that priority names are stored as small integers"""
+        task = Task.objects.create(title="High Task", priority="high")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT priority FROM core_task WHERE id = %s", [task.pk])
+            self.assertEqual(cursor.fetchone()[0], 3)
+
+    def test_priority_loaded_as_name(self):
+        """Test that priority reads back as its name"""
+        task = Task.objects.create(title="Low Task", priority="low")
+        task.refresh_from_db()
+        self.assertEqual(task.priority, "low")
+        self.assertEqual(task.get_priority_display(), "Low")
+
+    def test_filter_by_priority_name(self):
+        """Test that priority can be filtered by name"""
+        high = Task.objects.create(title="High Task", priority="high")
+        Task.objects.create(title="Low Task", priority="low")
+        self.assertEqual(list(Task.objects.filter(priority="high")), [high])
+        self.assertEqual(Task.objects.filter(priority__in=["high", "low"]).count(), 2)
+
+    def test_by_urgency_orders_high_first(self):
+        """Test that urgency ordering puts high before medium before low"""
+        low = Task.objects.create(title="Low Task", priority="low")
+        high = Task.objects.create(title="High Task", priority="high")
+        medium = Task.objects.create(title="Medium Task", priority="medium")
+        self.assertEqual(list(Task.objects.by_urgency()), [high, medium, low])
+
+    def test_by_urgency_orders_by_due_date_within_priority(self):
+        """Test that tasks with the same priority are ordered by due date"""
+        now = timezone.now()
+        later = Task.objects.create(title="Later", priority="high", due_date=now + timezone.timedelta(days=2))
+        sooner = Task.objects.create(title="Sooner", priority="high", due_date=now + timezone.timedelta(days=1))
+        self.assertEqual(list(Task.objects.by_urgency()), [sooner, later])
+
+    def test_create_view_rejects_unknown_priority(self):
+        """Test that the create form rejects priorities outside the choices"""
+        response = self.client.post(reverse('task_create'), {
+            'title': 'Bad Priority',
+            'priority': 'urgent'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Task.objects.filter(title='Bad Priority').exists())
+
+    def test_unknown_integer_priority_rejected(self):
+        """Test that integers without a name are refused like unknown names"""
+        for value in [7, 0, True]:
+            with self.subTest(value=value), self.assertRaisesMessage(ValueError, "expected one of"):
+                with transaction.atomic():
+                    Task.objects.create(title="Bad Level", priority=value)
+        self.assertEqual(Task.objects.create(title="Level", priority=3).priority, 3)
+        self.assertEqual(Task.objects.get(title="Level").priority, 'high')
+
+    def test_unknown_stored_priority_still_loads(self):
+        """Test that a level written outside the ORM doesn't break reads"""
+        task = Task.objects.create(title="Odd Level")
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE core_task SET priority = 7 WHERE id = %s", [task.pk])
+        self.assertEqual(Task.objects.get(pk=task.pk).priority, 7)
+        response = self.client.get(reverse('task_list'))
+        self.assertContains(response, "Odd Level")
+
+
+class TaskQueryPlanTests(TestCase):
+    """Test that the main access paths are served by indexes"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertRegex(plan, rf"SEARCH core_task USING (COVERING )?INDEX {index_name} ")
+        self.assertNotIn("SCAN core_task", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_pending_list_uses_completed_created_index(self):
+        """Test that the pending list seeks the (completed, -created_at) index"""
+        queryset = Task.objects.pending().order_by('-created_at', '-id')[:20]
+        self.assertUsesIndex(queryset, 'task_completed_created_idx')
+
+    def test_completed_list_uses_completed_created_index(self):
+        """Test that the completed list seeks the (completed, -created_at) index"""
+        queryset = Task.objects.done().order_by('-created_at', '-id')[:20]
+        self.assertUsesIndex(queryset, 'task_completed_created_idx')
+
+    def test_urgency_sort_uses_priority_index(self):
+        """Test that sorting pending tasks by urgency needs no sort step"""
+        queryset = Task.objects.pending().by_urgency()[:20]
+        self.assertUsesIndex(queryset, 'task_completed_prio_due_idx')
+
+    def test_agenda_buckets_use_partial_due_index(self):
+        """Test that agenda range queries scan the pending due-date index"""
+        bounds = bucket_bounds()
+        for bucket in BUCKETS:
+            with self.subTest(bucket=bucket):
+                self.assertUsesIndex(bucket_queryset(bucket, bounds)[:20], 'task_pending_due_idx')
+
+    def test_agenda_counts_use_partial_due_index(self):
+        """Test that each bucket count is a range count on the partial index"""
+        with CaptureQueriesContext(connection) as queries:
+            get_bucket_counts(bucket_bounds())
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'])
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertEqual(plan.count('SEARCH core_task USING COVERING INDEX task_pending_due_idx'), len(BUCKETS))
+        self.assertNotIn('SCAN core_task', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_priority_filter_uses_priority_index(self):
+        """Test that filtering pending tasks by priority seeks the priority index"""
+        queryset = Task.objects.pending().filter(priority='high').order_by('due_date')
+        self.assertUsesIndex(queryset, 'task_completed_prio_due_idx')
+
+
+class TaskBulkViewTests(TestCase):
+    """Test cases for the bulk task mutation endpoint"""
+
+    def setUp(self):
+        """Create a few pending and completed tasks"""
+        self.pending = [Task.objects.create(title=f"Pending {i}") for i in range(3)]
+        self.completed = [Task.objects.create(title=f"Completed {i}", completed=True) for i in range(2)]
+
+    def post_bulk(self, operations):
+        return self.client.post(
+            reverse('task_bulk'),
+            data=json.dumps({'operations': operations}),
+            content_type='application/json'
+        )
+
+    def test_bulk_create(self):
+        """Test creating several tasks in one request"""
+        response = self.post_bulk([{'op': 'create', 'tasks': [
+            {'title': 'Bulk 1', 'priority': 'high'},
+            {'title': 'Bulk 2', 'description': 'Second'},
+        ]}])
+        self.assertEqual(response.status_code, 200)
+        created = response.json()['created']
+        self.assertEqual(len(created), 2)
+        self.assertEqual(Task.objects.get(pk=created[0]).priority, 'high')
+        self.assertEqual(Task.objects.get(pk=created[1]).description, 'Second')
+
+    def test_bulk_toggle_flips_each_task(self):
+        """Test that toggling flips pending and completed tasks alike"""
+        ids = [self.pending[0].pk, self.completed[0].pk]
+        response = self.post_bulk([{'op': 'toggle', 'ids': ids}])
+        self.assertEqual(response.json()['toggled'], 2)
+        self.assertTrue(Task.objects.get(pk=self.pending[0].pk).completed)
+        self.assertFalse(Task.objects.get(pk=self.completed[0].pk).completed)
+
+    def test_bulk_toggle_is_one_update(self):
+        """Test that toggling many tasks issues a single set-based UPDATE"""
+        ids = [task.pk for task in self.pending + self.completed]
+        with CaptureQueriesContext(connection) as queries:
+            self.post_bulk([{'op': 'toggle', 'ids': ids}])
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('NOT', updates[0])
+
+    def test_bulk_toggle_updates_timestamp(self):
+        """Test that toggled tasks get a new updated_at"""
+        before = self.pending[0].updated_at
+        self.post_bulk([{'op': 'toggle', 'ids': [self.pending[0].pk]}])
+        self.assertGreater(Task.objects.get(pk=self.pending[0].pk).updated_at, before)
+
+    def test_bulk_set_priority(self):
+        """Test setting different priorities on several tasks"""
+        response = self.post_bulk([{'op': 'set_priority', 'tasks': [
+            {'id': self.pending[0].pk, 'priority': 'high'},
+            {'id': self.pending[1].pk, 'priority': 'low'},
+        ]}])
+        self.assertEqual(response.json()['updated'], 2)
+        self.assertEqual(Task.objects.get(pk=self.pending[0].pk).priority, 'high')
+        self.assertEqual(Task.objects.get(pk=self.pending[1].pk).priority, 'low')
+        self.assertEqual(Task.objects.get(pk=self.pending[1].pk).title, 'Pending 1')
+
+    def test_bulk_delete(self):
+        """Test deleting several tasks in one request"""
+        ids = [task.pk for task in self.completed]
+        response = self.post_bulk([{'op': 'delete', 'ids': ids}])
+        self.assertEqual(response.json()['deleted'], 2)
+        self.assertFalse(Task.objects.filter(pk__in=ids).exists())
+        self.assertEqual(TaskListState.objects.current().deleted_version, 1)
+
+    def test_bulk_delete_nothing(self):
+        """Test that an empty or unknown id list deletes nothing"""
+        response = self.post_bulk([{'op': 'delete', 'ids': []}, {'op': 'delete', 'ids': [999999]}])
+        self.assertEqual(response.json()['deleted'], 0)
+        self.assertEqual(Task.objects.count(), 5)
+        self.assertEqual(TaskListState.objects.current().deleted_version, 0)
+
+    def test_bulk_delete_is_constant_queries(self):
+        """Test that deleting many tasks costs the same queries as deleting one"""
+        ids = [Task.objects.create(title=f"Extra {i}").pk for i in range(50)]
+        apply_operations([{'op': 'delete', 'ids': ids[:1]}])
+        # Savepoint, one DELETE, one TaskListState update, release.
+        with self.assertNumQueries(4):
+            apply_operations([{'op': 'delete', 'ids': ids[1:]}])
+        self.assertEqual(TaskListState.objects.current().deleted_version, 2)
+
+    def test_operations_applied_in_order(self):
+        """Test a mixed batch: create, complete everything pending, then clear completed"""
+        response = self.post_bulk([
+            {'op': 'create', 'tasks': [{'title': 'Extra'}]},
+            {'op': 'toggle', 'ids': [task.pk for task in self.pending]},
+            {'op': 'delete', 'ids': [task.pk for task in self.pending + self.completed]},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ['Extra'])
+
+    def test_invalid_operation_writes_nothing(self):
+        """Test that one bad operation rejects the whole batch"""
+        response = self.post_bulk([
+            {'op': 'delete', 'ids': [self.pending[0].pk]},
+            {'op': 'archive', 'ids': [self.pending[1].pk]},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('1', response.json()['errors'])
+        self.assertTrue(Task.objects.filter(pk=self.pending[0].pk).exists())
+
+    def test_boolean_ids_rejected(self):
+        """Test that JSON true/false are not taken as task ids 1 and 0"""
+        for operation in [
+            {'op': 'toggle', 'ids': [True]},
+            {'op': 'delete', 'ids': [True]},
+            {'op': 'set_priority', 'tasks': [{'id': True, 'priority': 'high'}]},
+        ]:
+            with self.subTest(op=operation['op']):
+                response = self.post_bulk([operation])
+                self.assertEqual(response.status_code, 400)
+        task = Task.objects.get(pk=self.pending[0].pk)
+        self.assertFalse(task.completed)
+        self.assertEqual(task.priority, 'medium')
+
+    def test_invalid_create_reports_field_errors(self):
+        """Test that create validation errors are reported per task"""
+        response = self.post_bulk([{'op': 'create', 'tasks': [
+            {'title': 'Fine'},
+            {'description': 'No title'},
+        ]}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.json()['errors']['0']['1'])
+        self.assertFalse(Task.objects.filter(title='Fine').exists())
+
+    def test_invalid_json(self):
+        """Test that a malformed body is rejected"""
+        response = self.client.post(reverse('task_bulk'), data='not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_not_allowed(self):
+        """Test that the bulk endpoint only accepts POST"""
+        response = self.client.get(reverse('task_bulk'))
+        self.assertEqual(response.status_code, 405)
+
+
+class TaskListCacheTests(TestCase):
+    """Test cases for cached task list fragments"""
+
+    def setUp(self):
+        """Start from an empty cache with one pending and one completed task"""
+        cache.clear()
+        self.pending_task = Task.objects.create(title="Cached Pending")
+        self.completed_task = Task.objects.create(title="Cached Completed", completed=True)
+
+    def test_second_request_served_from_cache(self):
+        """Test that an unchanged list is rendered without querying tasks"""
+        self.client.get(reverse('task_list'))
+        # Only the three conditional-GET validator queries remain.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('task_list'))
+        self.assertContains(response, "Cached Pending")
+        self.assertContains(response, "Cached Completed")
+
+    def test_save_invalidates_cache(self):
+        """Test that saving a task bumps the list version"""
+        self.client.get(reverse('task_list'))
+        version = get_list_version()
+        Task.objects.create(title="Brand New Task")
+        self.assertNotEqual(get_list_version(), version)
+        self.assertContains(self.client.get(reverse('task_list')), "Brand New Task")
+
+    def test_delete_invalidates_cache(self):
+        """Test that deleting a task removes it from the cached list"""
+        self.client.get(reverse('task_list'))
+        self.client.post(reverse('task_delete', args=[self.pending_task.pk]))
+        self.assertNotContains(self.client.get(reverse('task_list')), "Cached Pending")
+
+    def test_toggle_invalidates_cache(self):
+        """Test that toggling moves the task to the other section"""
+        self.client.get(reverse('task_list'))
+        self.client.post(reverse('task_toggle', args=[self.pending_task.pk]))
+        response = self.client.get(reverse('task_list'))
+        self.assertEqual(response.context['pending_tasks'], [])
+        self.assertContains(response, "Pending Tasks (0)")
+
+    def test_bulk_operations_invalidate_cache(self):
+        """Test that set-based bulk updates, which send no signals, still invalidate"""
+        self.client.get(reverse('task_list'))
+        self.client.post(
+            reverse('task_bulk'),
+            data=json.dumps({'operations': [{'op': 'toggle', 'ids': [self.completed_task.pk]}]}),
+            content_type='application/json'
+        )
+        self.assertContains(self.client.get(reverse('task_list')), "Pending Tasks (2)")
+
+    def test_pages_cached_separately(self):
+        """Test that each cursor position has its own cache entry"""
+        for i in range(25):
+            Task.objects.create(title=f"Filler {i}")
+        first = self.client.get(reverse('task_list'))
+        second = self.client.get(reverse('task_list'), {'pending_after': first.context['pending_next_cursor']})
+        self.assertContains(second, "Cached Pending")
+        self.assertNotContains(first, "Cached Pending")
+
+    def test_cached_fragment_gets_request_csrf_token(self):
+        """Test that cached fragments never leak a shared CSRF token"""
+        self.client.get(reverse('task_list'))
+        response = self.client.get(reverse('task_list'))
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        self.assertContains(response, 'name="csrfmiddlewaretoken"', count=5)
+
+
+class TaskListConditionalGetTests(TestCase):
+    """Test cases for ETag / Last-Modified handling on the task list"""
+
+    def setUp(self):
+        """Create one pending and one completed task"""
+        cache.clear()
+        self.pending_task = Task.objects.create(title="Conditional Pending")
+        self.completed_task = Task.objects.create(title="Conditional Completed", completed=True)
+
+    def get_list(self, **headers):
+        return self.client.get(reverse('task_list'), headers=headers)
+
+    def assertStale(self, etag):
+        response = self.get_list(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_response_has_validators(self):
+        """Test that the list carries a weak ETag, Last-Modified and private caching"""
+        response = self.get_list()
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_matching_etag_returns_304(self):
+        """Test that an unchanged list is answered with 304 before any list query"""
+        etag = self.get_list()['ETag']
+        with self.assertNumQueries(3):
+            response = self.get_list(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_rotated_csrf_cookie_changes_etag(self):
+        """Test that a new CSRF secret gets a fresh page instead of a 304"""
+        etag = self.get_list()['ETag']
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = 'x' * 32
+        response = self.get_list(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_matching_last_modified_returns_304(self):
+        """Test that If-Modified-Since is honoured when no ETag is sent"""
+        last_modified = self.get_list()['Last-Modified']
+        self.assertEqual(self.get_list(if_modified_since=last_modified).status_code, 304)
+
+    def test_create_changes_etag(self):
+        """Test that creating a task invalidates the ETag"""
+        etag = self.get_list()['ETag']
+        self.client.post(reverse('task_create'), {'title': 'Another', 'priority': 'low'})
+        self.assertStale(etag)
+
+    def test_toggle_changes_etag(self):
+        """Test that toggling a task invalidates the ETag"""
+        etag = self.get_list()['ETag']
+        self.client.post(reverse('task_toggle', args=[self.pending_task.pk]))
+        self.assertStale(etag)
+
+    def test_delete_changes_etag(self):
+        """Test that deleting a task invalidates the ETag"""
+        etag = self.get_list()['ETag']
+        self.client.post(reverse('task_delete', args=[self.completed_task.pk]))
+        self.assertStale(etag)
+        self.assertEqual(TaskListState.objects.current().deleted_version, 1)
+
+    def test_delete_moves_last_modified(self):
+        """Test that a delete, which leaves no updated_at behind, still moves Last-Modified"""
+        Task.objects.filter(pk=self.pending_task.pk).update(
+            updated_at=timezone.now() - timezone.timedelta(days=1)
+        )
+        Task.objects.filter(pk=self.completed_task.pk).update(
+            updated_at=timezone.now() - timezone.timedelta(days=2)
+        )
+        last_modified = self.get_list()['Last-Modified']
+        self.pending_task.delete()
+        response = self.get_list(if_modified_since=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+    def test_import_moves_last_modified(self):
+        """Test that imported rows, which keep their older updated_at, still move Last-Modified"""
+        Task.objects.update(updated_at=timezone.now() - timezone.timedelta(days=1))
+        last_modified = self.get_list()['Last-Modified']
+        old = (timezone.now() - timezone.timedelta(days=30)).isoformat()
+        import_tasks(read_ndjson([json.dumps({'title': 'Imported', 'created_at': old, 'updated_at': old})]))
+        response = self.get_list(if_modified_since=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Imported")
+
+    def test_seed_moves_last_modified(self):
+        """Test that seeded rows move Last-Modified too"""
+        Task.objects.update(updated_at=timezone.now() - timezone.timedelta(days=1))
+        last_modified = self.get_list()['Last-Modified']
+        seed_tasks(5, days=30)
+        self.assertEqual(self.get_list(if_modified_since=last_modified).status_code, 200)
+
+    def test_bulk_operations_change_etag(self):
+        """Test that set-based bulk writes invalidate the ETag"""
+        etag = self.get_list()['ETag']
+        self.client.post(
+            reverse('task_bulk'),
+            data=json.dumps({'operations': [{'op': 'set_priority', 'tasks': [
+                {'id': self.pending_task.pk, 'priority': 'high'},
+            ]}]}),
+            content_type='application/json'
+        )
+        self.assertStale(etag)
+
+    def test_pages_have_distinct_etags(self):
+        """Test that each cursor position validates separately"""
+        for i in range(25):
+            Task.objects.create(title=f"Filler {i}")
+        first = self.get_list()
+        second = self.client.get(
+            reverse('task_list'),
+            {'pending_after': first.context['pending_next_cursor']},
+            headers={'if_none_match': first['ETag']}
+        )
+        self.assertEqual(second.status_code, 200)
+
+    def test_validator_uses_updated_index(self):
+        """Test that the validator aggregate is read off the updated_at index"""
+        with CaptureQueriesContext(connection) as queries:
+            get_list_validators(RequestFactory().get(reverse('task_list')))
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'])
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('task_updated_idx', plan)
+
+    @override_settings(ROOT_URLCONF='core.async_urls')
+    async def test_async_view_returns_304(self):
+        """Test that the async list view honours If-None-Match too"""
+        response = await self.async_client.get(reverse('task_list'))
+        etag = response['ETag']
+        response = await self.async_client.get(reverse('task_list'), headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 304)
+
+
+class TaskTransferTests(TestCase):
+    """Test cases for streaming export and batched import"""
+
+    def setUp(self):
+        """Create tasks covering every field, including awkward text"""
+        cache.clear()
+        self.due = timezone.now().replace(microsecond=0) + timezone.timedelta(days=3)
+        self.first = Task.objects.create(
+            title="Export, with comma",
+            description='Line one\nline "two"',
+            priority="high",
+            due_date=self.due,
+        )
+        self.second = Task.objects.create(title="Exported done", completed=True, priority="low")
+
+    def streamed(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def export_to_file(self, format):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / f'tasks.{format}'
+        call_command('export_tasks', str(path), stderr=StringIO())
+        return path
+
+    def import_file(self, path, **options):
+        out = StringIO()
+        call_command('import_tasks', str(path), stdout=out, **options)
+        return out.getvalue()
+
+    def test_export_ndjson_view(self):
+        """Test that the export endpoint streams one JSON object per task"""
+        response = self.client.get(reverse('task_export'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.streamed(response).splitlines()]
+        self.assertEqual([row['title'] for row in rows], ["Export, with comma", "Exported done"])
+        self.assertEqual(rows[0]['priority'], 'high')
+        self.assertEqual(rows[0]['due_date'], self.due.isoformat())
+        self.assertTrue(rows[1]['completed'])
+
+    def test_export_csv_view(self):
+        """Test that CSV export quotes commas and newlines"""
+        response = self.client.get(reverse('task_export'), {'format': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(StringIO(self.streamed(response))))
+        self.assertEqual(rows[0]['title'], "Export, with comma")
+        self.assertEqual(rows[0]['description'], 'Line one\nline "two"')
+        self.assertEqual(rows[1]['description'], '')
+
+    def test_export_empty_csv_has_header(self):
+        """Test that an empty table still exports the CSV header"""
+        Task.objects.all().delete()
+        response = self.client.get(reverse('task_export'), {'format': 'csv'})
+        self.assertEqual(self.streamed(response).strip(), ','.join(FIELDS))
+
+    def test_export_invalid_format(self):
+        """Test that an unknown format is rejected"""
+        response = self.client.get(reverse('task_export'), {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_reads_in_chunks(self):
+        """Test that the exporter yields several chunks rather than one body"""
+        for i in range(5):
+            Task.objects.create(title=f"Chunk {i}")
+        self.assertEqual(len(list(export_tasks('ndjson', chunk_size=2))), 4)
+
+    def test_round_trip(self):
+        """Test that export then import recreates every field, timestamps included"""
+        for format in FORMATS:
+            with self.subTest(format=format):
+                path = self.export_to_file(format)
+                originals = list(Task.objects.order_by('pk').values(*FIELDS))
+                Task.objects.all().delete()
+                self.assertIn('Imported 2 tasks', self.import_file(path))
+                self.assertEqual(list(Task.objects.order_by('pk').values(*FIELDS)), originals)
+
+    def test_import_in_batches(self):
+        """Test that rows are inserted one statement per batch"""
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'tasks.ndjson'
+        path.write_text(''.join(json.dumps({'title': f'Batch {i}'}) + '\n' for i in range(5)))
+        with CaptureQueriesContext(connection) as queries:
+            self.import_file(path, batch_size=2)
+        inserts = [q for q in queries if 'INSERT INTO "core_task"' in q['sql']]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(Task.objects.get(title='Batch 0').priority, 'medium')
+
+    def test_import_invalid_row(self):
+        """Test that a bad row stops the import, keeping earlier batches"""
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'tasks.csv'
+        path.write_text('title,priority\nGood one,low\nGood two,high\n,low\nNever,low\n')
+        with self.assertRaisesMessage(CommandError, "Line 4: 'title' is required."):
+            self.import_file(path, batch_size=2)
+        self.assertTrue(Task.objects.filter(title='Good two').exists())
+        self.assertFalse(Task.objects.filter(title='Never').exists())
+
+    def test_import_rejects_bad_values(self):
+        """Test that priorities, booleans and dates are validated"""
+        for row, message in [
+            ({'title': 'x', 'priority': 'urgent'}, "'priority'"),
+            ({'title': 'x', 'completed': 'maybe'}, "'completed'"),
+            ({'title': 'x', 'due_date': 'soon'}, "'due_date'"),
+            ({'title': 'x', 'due_date': '2024-02-30T10:00:00'}, "'due_date'"),
+            ({'title': 'x', 'created_at': '2024-01-01T25:00:00'}, "'created_at'"),
+            ({'title': 'x' * 201}, "'title'"),
+        ]:
+            with self.subTest(row=row), self.assertRaisesMessage(TaskImportError, message):
+                import_tasks(read_ndjson([json.dumps(row)]))
+
+    def test_import_out_of_range_date_reports_line(self):
+        """Test that an impossible date keeps its line number"""
+        lines = [json.dumps({'title': 'ok'}), json.dumps({'title': 'bad', 'due_date': '2024-02-30T10:00:00'})]
+        with self.assertRaisesMessage(TaskImportError, 'Line 2:'):
+            import_tasks(read_ndjson(lines))
+
+    def test_import_invalidates_list(self):
+        """Test that imported tasks show up on a previously cached list"""
+        self.client.get(reverse('task_list'))
+        import_tasks(read_ndjson([json.dumps({'title': 'Imported later'})]))
+        self.assertContains(self.client.get(reverse('task_list')), "Imported later")
+
+    def test_imported_tasks_are_searchable(self):
+        """Test that the search index triggers cover bulk imports"""
+        import_tasks(read_ndjson([json.dumps({'title': 'Zeppelin tickets'})]))
+        tasks, _ = search_tasks('zeppelin')
+        self.assertEqual([task.title for task in tasks], ['Zeppelin tickets'])
+
+    @override_settings(ROOT_URLCONF='core.async_urls')
+    async def test_async_export(self):
+        """Test that the ASGI export streams from an async iterator"""
+        response = await self.async_client.get(reverse('task_export'), {'format': 'csv'})
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(len(list(csv.DictReader(StringIO(body)))), 2)
+
+
+class TaskSeedTests(TestCase):
+    """Test cases for the seed data generator"""
+
+    def test_seed_command(self):
+        """Test that the command inserts the requested number of tasks in batches"""
+        out = StringIO()
+        call_command('seed_tasks', '250', '--batch-size', '100', stdout=out)
+        self.assertIn('Seeded 250 tasks', out.getvalue())
+        self.assertEqual(Task.objects.count(), 250)
+
+    def test_rows_are_realistic(self):
+        """Test that seeded rows mix states, priorities and dates"""
+        seed_tasks(500, completed_ratio=0.7, days=30)
+        completed = Task.objects.done().count()
+        self.assertTrue(250 < completed < 450)
+        self.assertEqual(set(Task.objects.values_list('priority', flat=True)), {'low', 'medium', 'high'})
+        self.assertTrue(Task.objects.filter(due_date__isnull=True).exists())
+        self.assertTrue(Task.objects.filter(due_date__isnull=False).exists())
+        oldest = Task.objects.order_by('created_at').first().created_at
+        self.assertLess(oldest, timezone.now() - timezone.timedelta(days=29))
+        self.assertFalse(Task.objects.filter(updated_at__lt=F('created_at')).exists())
+
+    def test_same_seed_same_rows(self):
+        """Test that a seed reproduces the same data"""
+        now = timezone.now()
+        self.assertEqual(list(generate_rows(20, seed=1, now=now)), list(generate_rows(20, seed=1, now=now)))
+        self.assertNotEqual(list(generate_rows(20, seed=1, now=now)), list(generate_rows(20, seed=2, now=now)))
+
+    def test_seeded_tasks_are_searchable(self):
+        """Test that the search triggers cover seeded rows"""
+        seed_tasks(200)
+        tasks, _ = search_tasks('meeting')
+        self.assertTrue(tasks)
+
+
+class RequestProfilingTests(TestCase):
+    """Test cases for the request timing and SQL instrumentation"""
+
+    def setUp(self):
+        """Start from empty metrics and cache with one task"""
+        metrics.reset()
+        cache.clear()
+        self.task = Task.objects.create(title="Profiled Task")
+
+    def server_timing(self, response):
+        timings = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *fields = entry.split(';')
+            timings[name] = dict(field.split('=', 1) for field in fields)
+        return timings
+
+    def profile(self, get_response, request=None):
+        middleware = RequestProfilingMiddleware(get_response)
+        return middleware(request or RequestFactory().get('/'))
+
+    def test_server_timing_header(self):
+        """Test that the header reports SQL, template, view and total time"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task_list'))
+        timings = self.server_timing(response)
+        self.assertEqual(set(timings), {'db', 'tpl', 'view', 'total'})
+        self.assertEqual(timings['db']['desc'], f'"{len(queries)} queries"')
+        self.assertGreater(float(timings['tpl']['dur']), 0)
+        self.assertGreaterEqual(float(timings['total']['dur']), float(timings['db']['dur']))
+
+    def test_not_modified_renders_no_templates(self):
+        """Test that a 304 spends no time in templates"""
+        etag = self.client.get(reverse('task_list'))['ETag']
+        response = self.client.get(reverse('task_list'), headers={'if_none_match': etag})
+        self.assertEqual(float(self.server_timing(response)['tpl']['dur']), 0)
+
+    def test_n_plus_one_logged(self):
+        """Test that a SELECT repeated with different parameters is flagged"""
+        def view(request):
+            for pk in range(settings.N_PLUS_ONE_THRESHOLD):
+                Task.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        with self.assertLogs('core.instrumentation', 'WARNING') as logs:
+            self.profile(view)
+        self.assertIn('Possible N+1', logs.output[0])
+        self.assertEqual(metrics.snapshot()['routes']['<unresolved>']['n_plus_one_requests'], 1)
+
+    def test_few_repeats_not_flagged(self):
+        """Test that repeats below the threshold are not N+1"""
+        profile = RequestProfile()
+        for pk in range(settings.N_PLUS_ONE_THRESHOLD - 1):
+            profile.add_query('SELECT 1 WHERE id = %s', (pk,), 0.001)
+        profile.add_query('UPDATE t SET x = %s', (1,), 0.001)
+        profile.add_query('UPDATE t SET x = %s', (1,), 0.001)
+        self.assertEqual(profile.n_plus_one(settings.N_PLUS_ONE_THRESHOLD), {})
+        self.assertEqual(profile.duplicates(), {})
+
+    def test_duplicate_query_logged(self):
+        """Test that an identical SELECT run twice is flagged"""
+        def view(request):
+            Task.objects.filter(pk=self.task.pk).exists()
+            Task.objects.filter(pk=self.task.pk).exists()
+            return HttpResponse()
+
+        with self.assertLogs('core.instrumentation', 'WARNING') as logs:
+            self.profile(view)
+        self.assertIn('Duplicate query', logs.output[0])
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_request_logged_with_sql(self):
+        """Test that slow requests are logged with each query"""
+        with self.assertLogs('core.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('task_list'))
+        slow = [line for line in logs.output if 'Slow request GET /' in line]
+        self.assertEqual(len(slow), 1)
+        self.assertIn('core_task', slow[0])
+
+    def test_metrics_require_staff(self):
+        """Test that the metrics endpoint is hidden from anonymous users"""
+        response = self.client.get(reverse('request_metrics'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_metrics_per_route(self):
+        """Test that staff see per-route histograms"""
+        self.client.get(reverse('task_list'))
+        self.client.get(reverse('task_list'))
+        self.client.post(reverse('task_toggle', args=[self.task.pk]))
+        staff = User.objects.create_user('admin', password='secret', is_staff=True)
+        self.client.force_login(staff)
+
+        routes = self.client.get(reverse('request_metrics')).json()['routes']
+        self.assertEqual(routes['/']['count'], 2)
+        self.assertEqual(sum(routes['/']['buckets']), 2)
+        self.assertIsNotNone(routes['/']['p50_ms'])
+        self.assertGreater(routes['/']['queries_per_request'], 0)
+        self.assertEqual(routes['/task/<int:pk>/toggle/']['count'], 1)
+
+    @override_settings(ROOT_URLCONF='core.async_urls')
+    async def test_async_requests_profiled(self):
+        """Test that the middleware also times async views"""
+        response = await self.async_client.get(reverse('task_list'))
+        timings = self.server_timing(response)
+        self.assertNotEqual(timings['db']['desc'], '"0 queries"')
+        self.assertGreater(float(timings['tpl']['dur']), 0)
+
+
+class TaskArchiveTests(TestCase):
+    """Test cases for archiving long-completed tasks"""
+
+    def setUp(self):
+        """Create old and recent tasks in both states"""
+        cache.clear()
+        long_ago = timezone.now() - timezone.timedelta(days=40)
+        self.old_done = [Task.objects.create(title=f"Old done {i}", completed=True) for i in range(5)]
+        self.recent_done = Task.objects.create(title="Recent done", completed=True)
+        self.old_pending = Task.objects.create(title="Old pending")
+        Task.objects.exclude(pk=self.recent_done.pk).update(updated_at=long_ago)
+
+    def test_archives_only_old_completed_tasks(self):
+        """Test that only tasks completed before the cutoff are moved"""
+        self.assertEqual(archive_completed(days=30), 5)
+        self.assertEqual(
+            set(Task.objects.values_list('title', flat=True)),
+            {"Recent done", "Old pending"}
+        )
+        archived = ArchivedTask.objects.get(task_id=self.old_done[0].pk)
+        self.assertEqual(archived.title, "Old done 0")
+        self.assertEqual(archived.created_at, self.old_done[0].created_at)
+        self.assertLess(archived.completed_at, timezone.now() - timezone.timedelta(days=30))
+
+    def test_archives_in_batches(self):
+        """Test that each batch is one INSERT ... SELECT and one DELETE"""
+        with CaptureQueriesContext(connection) as queries:
+            archive_completed(days=30, batch_size=2)
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO core_archivedtask')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(ArchivedTask.objects.count(), 5)
+
+    def test_archived_tasks_leave_list_and_search(self):
+        """Test that archiving invalidates the cached list, its ETag and the search index"""
+        response = self.client.get(reverse('task_list'))
+        etag = response['ETag']
+        self.assertContains(response, "Old done 0")
+        archive_completed(days=30)
+        response = self.client.get(reverse('task_list'), headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Old done 0")
+        self.assertEqual(search_tasks('old done')[0], [])
+
+    def test_command(self):
+        """Test the archive_tasks management command"""
+        out = StringIO()
+        call_command('archive_tasks', '--days', '30', stdout=out)
+        self.assertIn('Archived 5 tasks', out.getvalue())
+        call_command('archive_tasks', '--days', '0', stdout=out)
+        self.assertIn('Archived 1 tasks', out.getvalue())
+
+    def test_archive_view(self):
+        """Test that the archive page reads from the archive table"""
+        archive_completed(days=30)
+        response = self.client.get(reverse('task_archive'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'core/archive.html')
+        self.assertContains(response, "Old done 4")
+        self.assertNotContains(response, "Recent done")
+
+    def test_archive_view_pagination(self):
+        """Test keyset pagination over archived tasks"""
+        for i in range(25):
+            Task.objects.create(title=f"Bulk done {i}", completed=True)
+        archive_completed(days=0)
+        first = self.client.get(reverse('task_archive'))
+        self.assertEqual(len(first.context['tasks']), 20)
+        second = self.client.get(reverse('task_archive'), {'after': first.context['next_cursor']})
+        self.assertEqual(len(second.context['tasks']), ArchivedTask.objects.count() - 20)
+        self.assertIsNone(second.context['next_cursor'])
+
+    def test_live_list_does_not_query_archive(self):
+        """Test that the task list never touches the archive table"""
+        archive_completed(days=30)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('task_list'))
+        self.assertFalse(any('core_archivedtask' in q['sql'] for q in queries))
+
+
+class TaskCounterTests(TestCase):
+    """Test cases for the trigger-maintained task counters"""
+
+    def assertCountersMatch(self):
+        self.assertEqual(reconcile_counters(fix=False), [])
+
+    def get_counter(self, priority, completed):
+        return TaskCounter.objects.get(priority=priority, completed=completed).count
+
+    def test_single_task_writes(self):
+        """Test that create, toggle, priority change and delete move the counts"""
+        task = Task.objects.create(title="Counted", priority="high")
+        self.assertEqual(self.get_counter('high', False), 1)
+        task.completed = True
+        task.save(update_fields=['completed', 'updated_at'])
+        self.assertEqual((self.get_counter('high', False), self.get_counter('high', True)), (0, 1))
+        task.priority = 'low'
+        task.save()
+        self.assertEqual((self.get_counter('high', True), self.get_counter('low', True)), (0, 1))
+        task.delete()
+        self.assertEqual(self.get_counter('low', True), 0)
+        self.assertCountersMatch()
+
+    def test_bulk_operations(self):
+        """Test that the set-based bulk statements keep the counts exact"""
+        response = self.client.post(reverse('task_bulk'), {'operations': [
+            {'op': 'create', 'tasks': [{'title': f'Bulk {i}', 'priority': 'low'} for i in range(4)]},
+        ]}, content_type='application/json')
+        ids = response.json()['created']
+        self.client.post(reverse('task_bulk'), {'operations': [
+            {'op': 'toggle', 'ids': ids[:3]},
+            {'op': 'set_priority', 'tasks': [{'id': ids[0], 'priority': 'high'}]},
+            {'op': 'delete', 'ids': ids[1:2]},
+        ]}, content_type='application/json')
+        self.assertEqual(self.get_counter('low', False), 1)
+        self.assertEqual(self.get_counter('low', True), 1)
+        self.assertEqual(self.get_counter('high', True), 1)
+        self.assertCountersMatch()
+
+    def test_raw_sql_write_paths(self):
+        """Test that import, seeding and archiving keep the counts exact"""
+        import_tasks(read_ndjson([json.dumps({'title': f'Imported {i}', 'completed': True}) + '\n' for i in range(3)]))
+        seed_tasks(200, batch_size=50)
+        Task.objects.update(updated_at=timezone.now() - timezone.timedelta(days=40))
+        archive_completed(days=30)
+        self.assertFalse(Task.objects.done().exists())
+        self.assertEqual(TaskCounter.objects.total(), Task.objects.count())
+        self.assertCountersMatch()
+
+    def test_rolled_back_write_leaves_counts(self):
+        """Test that counters change in the same transaction as the task"""
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Task.objects.create(title="Rolled back")
+            raise RuntimeError
+        self.assertEqual(TaskCounter.objects.total(), 0)
+
+    def test_section_counts_skip_task_table(self):
+        """Test that the list view's counts are read from the counters alone"""
+        Task.objects.create(title="Pending")
+        Task.objects.create(title="Done", completed=True, priority="low")
+        with CaptureQueriesContext(connection) as queries:
+            counts = TaskListView().get_section_counts()
+        self.assertEqual(counts, {'pending_count': 1, 'completed_count': 1})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"core_task"', queries[0]['sql'])
+
+    def test_reconcile_fixes_drift(self):
+        """Test that reconciliation reports and corrects wrong counters"""
+        Task.objects.create(title="Pending")
+        TaskCounter.objects.filter(priority='medium', completed=False).update(count=7)
+        TaskCounter.objects.create(priority='high', completed=True, count=2)
+        self.assertEqual(reconcile_counters(), [('high', True, 2, 0), ('medium', False, 7, 1)])
+        self.assertCountersMatch()
+
+    def test_reconcile_refreshes_cached_counts(self):
+        """Test that corrected counts reach the cached list sections"""
+        cache.clear()
+        Task.objects.create(title="Pending")
+        TaskCounter.objects.filter(priority='medium', completed=False).update(count=7)
+        self.assertContains(self.client.get(reverse('task_list')), "Pending Tasks (7)")
+        reconcile_counters()
+        self.assertContains(self.client.get(reverse('task_list')), "Pending Tasks (1)")
+
+    def test_reconcile_recreates_triggers(self):
+        """Test that triggers lost to a table rebuild are restored"""
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER core_task_counter_insert')
+        Task.objects.create(title="Missed")
+        self.assertEqual(reconcile_counters(), [('medium', False, 0, 1)])
+        Task.objects.create(title="Counted")
+        self.assertEqual(self.get_counter('medium', False), 2)
+
+    def test_reconcile_command(self):
+        """Test the command's report and its --check mode"""
+        Task.objects.create(title="Pending")
+        out = StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('match', out.getvalue())
+
+        TaskCounter.objects.update(count=0)
+        with self.assertRaises(CommandError):
+            call_command('reconcile_task_counters', '--check', stdout=StringIO())
+        self.assertEqual(TaskCounter.objects.total(), 0)
+
+        out = StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('medium/pending: stored 0, actual 1 (-1)', out.getvalue())
+        self.assertIn('Corrected 1 task counters', out.getvalue())
+        self.assertCountersMatch()
+
+
+class AgendaTests(TestCase):
+    """Test cases for the due-date agenda"""
+
+    def setUp(self):
+        """Create pending tasks in every bucket plus ones that never appear"""
+        self.now = timezone.now()
+        bounds = bucket_bounds(self.now)
+        self.overdue = Task.objects.create(title="Overdue task", due_date=self.now - timezone.timedelta(days=3))
+        self.today = Task.objects.create(title="Today task", due_date=self.now + (bounds['today'][1] - self.now) / 2)
+        self.week = Task.objects.create(title="Week task", due_date=bounds['week'][0] + timezone.timedelta(days=2))
+        Task.objects.create(title="Far future task", due_date=self.now + timezone.timedelta(days=30))
+        Task.objects.create(title="Undated task")
+        Task.objects.create(title="Done overdue task", completed=True, due_date=self.now - timezone.timedelta(days=1))
+
+    def test_bucket_counts_in_one_query(self):
+        """Test that all bucket counts come from a single query"""
+        with self.assertNumQueries(1):
+            counts = get_bucket_counts(bucket_bounds(self.now))
+        self.assertEqual(counts, {'overdue': 1, 'today': 1, 'week': 1})
+
+    def test_buckets(self):
+        """Test that each bucket holds only pending tasks in its range"""
+        bounds = bucket_bounds(self.now)
+        titles = {
+            bucket: [task.title for task in bucket_queryset(bucket, bounds)]
+            for bucket in BUCKETS
+        }
+        self.assertEqual(titles, {
+            'overdue': ["Overdue task"],
+            'today': ["Today task"],
+            'week': ["Week task"],
+        })
+
+    def test_bucket_bounds(self):
+        """Test that today ends at local midnight and the week spans seven days"""
+        bounds = bucket_bounds(self.now)
+        tomorrow = bounds['today'][1]
+        self.assertEqual(timezone.localtime(tomorrow).time(), timezone.datetime.min.time())
+        self.assertEqual(bounds['week'][1] - self.now.replace(hour=0, minute=0, second=0, microsecond=0),
+                         timezone.timedelta(days=7))
+
+    def test_agenda_view(self):
+        """Test that the agenda page shows the three sections with counts"""
+        response = self.client.get(reverse('agenda'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'core/agenda.html')
+        for heading in ["Overdue (1)", "Due Today (1)", "Due This Week (1)"]:
+            self.assertContains(response, heading)
+        self.assertNotContains(response, "Far future task")
+        self.assertNotContains(response, "Done overdue task")
+
+    def test_agenda_pagination(self):
+        """Test keyset pagination within one bucket, in due-date order"""
+        for i in range(25):
+            Task.objects.create(title=f"Late {i}", due_date=self.now - timezone.timedelta(days=10, hours=i))
+        first = self.client.get(reverse('agenda'))
+        overdue = first.context['sections'][0]
+        self.assertEqual(overdue['count'], 26)
+        self.assertEqual(len(overdue['tasks']), 20)
+        self.assertEqual(overdue['tasks'][0].title, "Late 24")
+        second = self.client.get(reverse('agenda') + overdue['older_url'])
+        page = second.context['sections'][0]['tasks']
+        self.assertEqual(len(page), 6)
+        self.assertEqual(page[-1], self.overdue)
+
+    def test_bucket_endpoint(self):
+        """Test the JSON endpoint for one bucket"""
+        data = self.client.get(reverse('agenda_bucket', args=['overdue'])).json()
+        self.assertEqual([task['id'] for task in data['tasks']], [self.overdue.pk])
+        self.assertIsNone(data['next'])
+
+    def test_bucket_endpoint_pagination(self):
+        """Test that the JSON endpoint pages with an opaque cursor"""
+        for i in range(25):
+            Task.objects.create(title=f"Soon {i}", due_date=bucket_bounds(self.now)['week'][0] + timezone.timedelta(hours=i))
+        first = self.client.get(reverse('agenda_bucket', args=['week'])).json()
+        second = self.client.get(reverse('agenda_bucket', args=['week']), {'after': first['next']}).json()
+        ids = [task['id'] for task in first['tasks'] + second['tasks']]
+        self.assertEqual(len(ids), 26)
+        self.assertEqual(len(set(ids)), 26)
+
+    def test_unknown_bucket(self):
+        """Test that an unknown bucket is a 404"""
+        response = self.client.get(reverse('agenda_bucket', args=['someday']))
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskSearchTests(TestCase):
+    """Test cases for full-text task search"""
+
+    def setUp(self):
+        """Create tasks with distinct words in titles and descriptions"""
+        self.groceries = Task.objects.create(title="Buy groceries", description="Milk, eggs and bread")
+        self.report = Task.objects.create(title="Write quarterly report", description="Include grocery budget")
+        self.dentist = Task.objects.create(title="Call dentist")
+
+    def search(self, text, **kwargs):
+        return search_tasks(text, **kwargs)[0]
+
+    def test_matches_title_and_description(self):
+        """Test that words in titles and descriptions are both found"""
+        self.assertEqual(self.search("dentist"), [self.dentist])
+        self.assertEqual(self.search("eggs"), [self.groceries])
+
+    def test_title_matches_rank_first(self):
+        """Test that a title match ranks above a description match"""
+        self.assertEqual(self.search("grocery"), [self.groceries, self.report])
+
+    def test_all_words_must_match(self):
+        """Test that multi-word queries require every word"""
+        self.assertEqual(self.search("quarterly budget"), [self.report])
+        self.assertEqual(self.search("quarterly dentist"), [])
+
+    def test_last_word_matches_as_prefix(self):
+        """Test that a partially typed last word still matches"""
+        self.assertEqual(self.search("quart"), [self.report])
+
+    def test_operators_in_input_are_plain_text(self):
+        """Test that FTS5 syntax in user input does not raise"""
+        self.assertEqual(self.search('dentist" OR (NEAR'), [])
+        self.assertEqual(build_match_query('"*'), None)
+        self.assertEqual(self.search(''), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that triggers keep the index in sync with core_task"""
+        self.dentist.title = "Call orthodontist"
+        self.dentist.save()
+        self.assertEqual(self.search("dentist"), [])
+        self.assertEqual(self.search("orthodontist"), [self.dentist])
+
+        self.dentist.delete()
+        self.assertEqual(self.search("orthodontist"), [])
+
+    def test_index_follows_bulk_writes(self):
+        """Test that rows written without signals are indexed too"""
+        Task.objects.bulk_create([Task(title="Renew passport")])
+        Task.objects.filter(pk=self.groceries.pk).update(title="Buy vegetables")
+        self.assertEqual(len(self.search("passport")), 1)
+        self.assertEqual(self.search("vegetables"), [self.groceries])
+
+    def test_pagination(self):
+        """Test that results are paginated in rank order"""
+        for i in range(5):
+            Task.objects.create(title=f"Paginate me {i}")
+        first, has_next = search_tasks("paginate", page=1, page_size=3)
+        second, has_more = search_tasks("paginate", page=2, page_size=3)
+        self.assertEqual(len(first), 3)
+        self.assertTrue(has_next)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(has_more)
+        self.assertFalse(set(first) & set(second))
+
+    def test_rebuild_command(self):
+        """Test that the rebuild command restores an emptied index"""
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO core_task_fts(core_task_fts) VALUES ('delete-all')")
+        self.assertEqual(self.search("dentist"), [])
+        call_command('rebuild_task_search', stdout=StringIO())
+        self.assertEqual(self.search("dentist"), [self.dentist])
+
+    def test_search_view(self):
+        """Test that the search page lists matching tasks"""
+        response = self.client.get(reverse('task_search'), {'q': 'groceries'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'core/search.html')
+        self.assertContains(response, "Buy groceries")
+        self.assertNotContains(response, "Call dentist")
+
+    def test_search_view_invalid_page(self):
+        """Test that a non-numeric page falls back to the first page"""
+        response = self.client.get(reverse('task_search'), {'q': 'dentist', 'page': 'x'})
+        self.assertContains(response, "Call dentist")
+
+
+class TaskFragmentTests(TestCase):
+    """Test the X-Fragment responses of the toggle, create and delete views"""
+
+    def setUp(self):
+        """Create one pending and one completed task"""
+        cache.clear()
+        self.pending_task = Task.objects.create(title="Fragment Pending")
+        self.completed_task = Task.objects.create(title="Fragment Completed", completed=True)
+
+    def test_toggle_json(self):
+        """Test that a JSON fragment carries the changed row and new counts"""
+        response = self.client.post(reverse('task_toggle', args=[self.pending_task.pk]), headers={'x_fragment': 'json'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['id'], self.pending_task.pk)
+        self.assertEqual(data['section'], 'completed')
+        self.assertIn(f'id="task-{self.pending_task.pk}"', data['html'])
+        self.assertIn('Undo', data['html'])
+        self.assertIn('name="csrfmiddlewaretoken"', data['html'])
+        self.assertEqual(data['counts'], {'pending': 0, 'completed': 2})
+
+    def test_toggle_html(self):
+        """Test that an HTML fragment is the row, with counts in headers"""
+        response = self.client.post(reverse('task_toggle', args=[self.completed_task.pk]), headers={'x_fragment': 'html'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.decode().startswith('<li'))
+        self.assertContains(response, "Fragment Completed")
+        self.assertEqual(response['X-Task-Id'], str(self.completed_task.pk))
+        self.assertEqual(response['X-Task-Section'], 'pending')
+        self.assertEqual(response['X-Task-Count-Pending'], '2')
+        self.assertEqual(response['X-Task-Count-Completed'], '0')
+
+    def test_unknown_fragment_format_redirects(self):
+        """Test that an unrecognised X-Fragment value keeps the redirect"""
+        response = self.client.post(reverse('task_toggle', args=[self.pending_task.pk]), headers={'x_fragment': 'xml'})
+        self.assertRedirects(response, reverse('task_list'))
+
+    def test_toggle_skips_list_queries(self):
+        """Test that a fragment toggle costs the write plus one count query"""
+        with self.assertNumQueries(3):
+            self.client.post(reverse('task_toggle', args=[self.pending_task.pk]), headers={'x_fragment': 'json'})
+
+    def test_create_json(self):
+        """Test creating a task in fragment mode"""
+        response = self.client.post(
+            reverse('task_create'), {'title': 'Fragment New', 'priority': 'high'}, headers={'x_fragment': 'json'}
+        )
+        task = Task.objects.get(title='Fragment New')
+        data = response.json()
+        self.assertEqual(data['id'], task.pk)
+        self.assertEqual(data['section'], 'pending')
+        self.assertIn('priority-high', data['html'])
+        self.assertEqual(data['counts'], {'pending': 2, 'completed': 1})
+
+    def test_create_invalid_json(self):
+        """Test that form errors come back as JSON with a 400"""
+        response = self.client.post(reverse('task_create'), {'priority': 'low'}, headers={'x_fragment': 'json'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.json()['errors'])
+
+    def test_delete_json(self):
+        """Test that deleting returns the id, no row and the new counts"""
+        pk = self.completed_task.pk
+        response = self.client.post(reverse('task_delete', args=[pk]), headers={'x_fragment': 'json'})
+        self.assertEqual(response.json(), {'id': pk, 'section': None, 'html': '', 'counts': {'pending': 1, 'completed': 0}})
+        self.assertFalse(Task.objects.filter(pk=pk).exists())
+
+    def test_fragment_invalidates_cached_list(self):
+        """Test that the next full render reflects a fragment write"""
+        self.client.get(reverse('task_list'))
+        self.client.post(reverse('task_toggle', args=[self.pending_task.pk]), headers={'x_fragment': 'json'})
+        response = self.client.get(reverse('task_list'))
+        self.assertContains(response, "Pending Tasks (0)")
+
+    def test_home_marks_fragment_forms(self):
+        """Test that the create, toggle and delete forms opt in to fragments"""
+        response = self.client.get(reverse('task_list'))
+        self.assertContains(response, 'data-fragment>', count=1)
+        self.assertContains(response, 'data-fragment style', count=4)
+        self.assertContains(response, 'data-title="Pending Tasks"')
+
+
+@override_settings(ROOT_URLCONF='core.async_urls')
+class AsyncTaskViewTests(TestCase):
+    """Test cases for the async views served under ASGI"""
+
+    def setUp(self):
+        """Create one pending and one completed task"""
+        cache.clear()
+        self.pending_task = Task.objects.create(title="Async Pending", priority="high")
+        self.completed_task = Task.objects.create(title="Async Completed", completed=True)
+
+    async def test_task_list(self):
+        """Test that the async list renders both sections"""
+        response = await self.async_client.get(reverse('task_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Async Pending")
+        self.assertContains(response, "Async Completed")
+        self.assertContains(response, "Pending Tasks (1)")
+
+    def test_routes_to_async_views(self):
+        """Test that the ASGI URLconf serves coroutine views"""
+        self.assertIs(resolve(reverse('task_list')).func, async_views.task_list)
+        self.assertIs(resolve(reverse('task_toggle', args=[1])).func, async_views.task_toggle)
+
+    async def test_task_list_matches_sync_view(self):
+        """Test that the async and sync list views render the same sections"""
+        async_response = await self.async_client.get(reverse('task_list'))
+        cache.clear()
+        with self.settings(ROOT_URLCONF='core.urls'):
+            sync_response = await self.async_client.get(reverse('task_list'))
+        self.assertEqual(async_response.context['pending_tasks'], sync_response.context['pending_tasks'])
+        self.assertEqual(async_response.context['completed_count'], sync_response.context['completed_count'])
+
+    async def test_create(self):
+        """Test creating a task through the async view"""
+        response = await self.async_client.post(reverse('task_create'), {
+            'title': 'Async New',
+            'priority': 'low'
+        })
+        self.assertRedirects(response, reverse('task_list'), fetch_redirect_response=False)
+        task = await Task.objects.aget(title='Async New')
+        self.assertEqual(task.priority, 'low')
+
+    async def test_create_invalid(self):
+        """Test that an invalid form is re-rendered"""
+        response = await self.async_client.post(reverse('task_create'), {'priority': 'low'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'core/task_form.html')
+
+    async def test_toggle(self):
+        """Test toggling a task through the async view"""
+        response = await self.async_client.post(reverse('task_toggle', args=[self.pending_task.pk]))
+        self.assertRedirects(response, reverse('task_list'), fetch_redirect_response=False)
+        await self.pending_task.arefresh_from_db()
+        self.assertTrue(self.pending_task.completed)
+
+    async def test_toggle_missing_task(self):
+        """Test that toggling an unknown task returns 404"""
+        response = await self.async_client.post(reverse('task_toggle', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_delete(self):
+        """Test deleting a task through the async view"""
+        response = await self.async_client.post(reverse('task_delete', args=[self.completed_task.pk]))
+        self.assertRedirects(response, reverse('task_list'), fetch_redirect_response=False)
+        self.assertFalse(await Task.objects.filter(pk=self.completed_task.pk).aexists())
+
+    async def test_toggle_fragment(self):
+        """Test the async toggle in fragment mode"""
+        response = await self.async_client.post(
+            reverse('task_toggle', args=[self.pending_task.pk]), headers={'x_fragment': 'json'}
+        )
+        data = response.json()
+        self.assertEqual(data['section'], 'completed')
+        self.assertEqual(data['counts'], {'pending': 0, 'completed': 2})
+
+    async def test_create_and_delete_fragments(self):
+        """Test the async create and delete in fragment mode"""
+        response = await self.async_client.post(
+            reverse('task_create'), {'title': 'Async Fragment', 'priority': 'low'}, headers={'x_fragment': 'html'}
+        )
+        self.assertContains(response, "Async Fragment")
+        self.assertEqual(response['X-Task-Count-Pending'], '2')
+        response = await self.async_client.post(
+            reverse('task_create'), {'priority': 'low'}, headers={'x_fragment': 'json'}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.post(
+            reverse('task_delete', args=[self.pending_task.pk]), headers={'x_fragment': 'json'}
+        )
+        self.assertEqual(response.json()['counts'], {'pending': 1, 'completed': 1})
+
+    async def test_writes_invalidate_cached_list(self):
+        """Test that async writes bump the cached list version"""
+        await self.async_client.get(reverse('task_list'))
+        await self.async_client.post(reverse('task_toggle', args=[self.pending_task.pk]))
+        response = await self.async_client.get(reverse('task_list'))
+        self.assertContains(response, "Pending Tasks (0)")
+
+
+class SQLiteConcurrencyTests(TransactionTestCase):
+    """Test the SQLite profile and the single writer under concurrent requests"""
+
+    @classmethod
+    def tearDownClass(cls):
+        # Release the writer thread's connection before the test database is destroyed.
+        writer.stop()
+        super().tearDownClass()
+
+    def test_journal_mode_is_wal(self):
+        """Test that connections are opened in WAL mode with IMMEDIATE transactions"""
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+    def test_writes_run_on_writer_thread(self):
+        """Test that writes outside a transaction are handed to the writer thread"""
+        self.assertEqual(run_write(lambda: threading.current_thread().name), "task-writer")
+
+    def test_writes_inside_transaction_run_inline(self):
+        """Test that writes inside an open transaction stay on the caller's connection"""
+        with transaction.atomic():
+            self.assertEqual(run_write(lambda: threading.current_thread().name), threading.current_thread().name)
+
+    def test_write_errors_propagate(self):
+        """Test that an exception raised on the writer thread reaches the caller"""
+        response = Client().post(reverse('task_toggle', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_writer_queries_are_profiled(self):
+        """Test that queries run on the writer thread count towards the request"""
+        task = Task.objects.create(title="Profiled write")
+        response = Client().post(reverse('task_toggle', args=[task.pk]))
+        db = response['Server-Timing'].split(', ')[0]
+        self.assertNotIn('desc="0 queries"', db)
+
+    def test_parallel_toggles_and_creates(self):
+        """Test that parallel toggles and creates finish without lock errors or lost updates"""
+        tasks = [Task.objects.create(title=f"Shared {i}") for i in range(10)]
+        thread_count, rounds = 8, 20
+        errors = []
+        toggles = Counter()
+
+        def worker(n):
+            client = Client()
+            try:
+                for i in range(rounds):
+                    if i % 2:
+                        task = tasks[(n + i) % len(tasks)]
+                        response = client.post(reverse('task_toggle', args=[task.pk]))
+                    else:
+                        response = client.post(reverse('task_create'), {'title': f"Worker {n}-{i}", 'priority': 'low'})
+                    if response.status_code != 302:
+                        errors.append(response.status_code)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        for n in range(thread_count):
+            for i in range(1, rounds, 2):
+                toggles[tasks[(n + i) % len(tasks)].pk] += 1
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Task.objects.filter(title__startswith="Worker").count(), thread_count * rounds // 2)
+        for task in tasks:
+            task.refresh_from_db()
+            self.assertEqual(task.completed, toggles[task.pk] % 2 == 1)
+
+
 class TaskURLTests(TestCase):
     """Test cases for URL routing"""
 
@@ -183,3 +1647,28 @@ class TaskURLTests(TestCase):
         """Test that task delete URL resolves correctly"""
         url = reverse('task_delete', args=[1])
         self.assertEqual(url, '/task/1/delete/')
+
+    def test_task_bulk_url_resolves(self):
+        """Test that task bulk URL resolves correctly"""
+        url = reverse('task_bulk')
+        self.assertEqual(url, '/task/bulk/')
+
+    def test_task_export_url_resolves(self):
+        """Test that task export URL resolves correctly"""
+        url = reverse('task_export')
+        self.assertEqual(url, '/task/export/')
+
+    def test_agenda_url_resolves(self):
+        """Test that agenda URLs resolve correctly"""
+        self.assertEqual(reverse('agenda'), '/agenda/')
+        self.assertEqual(reverse('agenda_bucket', args=['today']), '/agenda/today/')
+
+    def test_task_archive_url_resolves(self):
+        """Test that task archive URL resolves correctly"""
+        url = reverse('task_archive')
+        self.assertEqual(url, '/archive/')
+
+    def test_task_search_url_resolves(self):
+        """Test that task search URL resolves correctly"""
+        url = reverse('task_search')
+        self.assertEqual(url, '/search/')
@@ -0,0 +1,231 @@
+"""
+Streaming export and batched import of tasks as NDJSON or CSV.
+
+Exports walk the table with .iterator(chunk_size=...) and yield text in
+chunks, so memory stays flat whatever the table size. Imports parse the
+input one line at a time and insert a batch per transaction, so a large file
+never holds the write lock for long.
+"""
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .caching import invalidate_task_list
+from .models import PriorityField, Task, TaskListState
+
+FORMATS = ['ndjson', 'csv']
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+FIELDS = ['title', 'description', 'completed', 'priority', 'due_date', 'created_at', 'updated_at']
+DATETIME_FIELDS = ['due_date', 'created_at', 'updated_at']
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 2000
+TRUE_VALUES = {'true', '1', 'yes'}
+FALSE_VALUES = {'false', '0', 'no', ''}
+
+
+class TaskImportError(Exception):
+    """Raised for a row that can't be imported; earlier batches stay committed."""
+
+    def __init__(self, line, message):
+        super().__init__(f'Line {line}: {message}')
+        self.line = line
+
+
+def format_for_path(path):
+    """Guess the format from a file name, defaulting to NDJSON."""
+    return 'csv' if str(path).lower().endswith('.csv') else 'ndjson'
+
+
+def _export_rows(queryset, chunk_size):
+    rows = queryset.order_by('pk').values_list(*FIELDS).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield {
+            name: value.isoformat() if name in DATETIME_FIELDS and value is not None else value
+            for name, value in zip(FIELDS, row)
+        }
+
+
+def _chunked(lines, chunk_size):
+    # One yield per row would mean one socket write per row under WSGI.
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def iter_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    lines = (json.dumps(row) + '\n' for row in _export_rows(queryset, chunk_size))
+    return _chunked(lines, chunk_size)
+
+
+def iter_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    def lines():
+        writer.writeheader()
+        yield flush()
+        for row in _export_rows(queryset, chunk_size):
+            writer.writerow(row)
+            yield flush()
+
+    return _chunked(lines(), chunk_size)
+
+
+def export_tasks(format, queryset=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the tasks in `format` as a series of text chunks."""
+    if queryset is None:
+        queryset = Task.objects.all()
+    exporters = {'ndjson': iter_ndjson, 'csv': iter_csv}
+    return exporters[format](queryset, chunk_size)
+
+
+async def aexport_tasks(format, queryset=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Async counterpart of export_tasks() for ASGI. Django would otherwise
+    drain a sync iterator into memory before streaming it; this pulls one
+    chunk at a time on the sync thread that owns the database cursor.
+    """
+    chunks = export_tasks(format, queryset, chunk_size)
+    done = object()
+    while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+        yield chunk
+
+
+def read_ndjson(lines):
+    """Yield (line number, dict) for each non-blank line."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise TaskImportError(number, f'Invalid JSON: {exc.msg}.') from None
+        if not isinstance(row, dict):
+            raise TaskImportError(number, 'Expected a JSON object.')
+        yield number, row
+
+
+def read_csv(lines):
+    """Yield (line number, dict) for each data row; the first row is the header."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _parse_datetime(value, name, line):
+    if value in (None, ''):
+        return None
+    try:
+        parsed = parse_datetime(value) if isinstance(value, str) else None
+    except ValueError:
+        # Well formed but out of range, e.g. February 30th.
+        parsed = None
+    if parsed is None:
+        raise TaskImportError(line, f"'{name}' must be an ISO 8601 datetime.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _parse_completed(value, line):
+    if isinstance(value, bool) or value is None:
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in TRUE_VALUES | FALSE_VALUES:
+        return value.strip().lower() in TRUE_VALUES
+    raise TaskImportError(line, "'completed' must be true or false.")
+
+
+def parse_row(row, line):
+    """Validate one input record and return its values in FIELDS order."""
+    title = row.get('title')
+    max_length = Task._meta.get_field('title').max_length
+    if not isinstance(title, str) or not title.strip():
+        raise TaskImportError(line, "'title' is required.")
+    if len(title) > max_length:
+        raise TaskImportError(line, f"'title' is longer than {max_length} characters.")
+
+    description = row.get('description') or None
+    if description is not None and not isinstance(description, str):
+        raise TaskImportError(line, "'description' must be a string.")
+
+    priority = row.get('priority') or Task._meta.get_field('priority').default
+    if priority not in PriorityField.LEVELS:
+        raise TaskImportError(line, f"'priority' must be one of {list(PriorityField.LEVELS)}.")
+
+    now = timezone.now()
+    return (
+        title,
+        description,
+        _parse_completed(row.get('completed'), line),
+        PriorityField.LEVELS[priority],
+        _parse_datetime(row.get('due_date'), 'due_date', line),
+        _parse_datetime(row.get('created_at'), 'created_at', line) or now,
+        _parse_datetime(row.get('updated_at'), 'updated_at', line) or now,
+    )
+
+
+def insert_rows(batch):
+    """Insert tuples in FIELDS order, priority as its stored level, in one transaction."""
+    # A single prepared INSERT run with executemany() rather than
+    # bulk_create(): bulk_create overwrites created_at/updated_at (auto_now
+    # fields) and spends most of its time preparing values field by field.
+    # Rows keep their own updated_at, so the write is recorded in
+    # TaskListState for the list's Last-Modified (see conditional.py).
+    adapt = connection.ops.adapt_datetimefield_value
+    params = [
+        (title, description, completed, priority, adapt(due_date), adapt(created_at), adapt(updated_at))
+        for title, description, completed, priority, due_date, created_at, updated_at in batch
+    ]
+    columns = ', '.join(connection.ops.quote_name(name) for name in FIELDS)
+    placeholders = ', '.join(['%s'] * len(FIELDS))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {connection.ops.quote_name(Task._meta.db_table)} ({columns}) VALUES ({placeholders})',
+            params,
+        )
+        TaskListState.objects.record_insert(timezone.now())
+    return len(params)
+
+
+def import_tasks(rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Insert tasks from (line number, dict) pairs, as produced by read_ndjson()
+    or read_csv(), and return how many were created.
+
+    Rows are validated as they are read and inserted batch_size at a time,
+    each batch in its own transaction. An invalid row raises TaskImportError
+    after the batches before it have been committed.
+    """
+    imported = 0
+    batch = []
+    try:
+        for line, row in rows:
+            batch.append(parse_row(row, line))
+            if len(batch) >= batch_size:
+                imported += insert_rows(batch)
+                batch = []
+        if batch:
+            imported += insert_rows(batch)
+    finally:
+        if imported:
+            invalidate_task_list()
+    return imported
@@ -6,4 +6,11 @@ urlpatterns = [
     path('task/create/', views.TaskCreateView.as_view(), name='task_create'),
     path('task/<int:pk>/toggle/', views.task_toggle, name='task_toggle'),
     path('task/<int:pk>/delete/', views.TaskDeleteView.as_view(), name='task_delete'),
+    path('task/bulk/', views.task_bulk, name='task_bulk'),
+    path('agenda/', views.agenda, name='agenda'),
+    path('agenda/<slug:bucket>/', views.agenda_bucket, name='agenda_bucket'),
+    path('archive/', views.task_archive, name='task_archive'),
+    path('task/export/', views.task_export, name='task_export'),
+    path('search/', views.task_search, name='task_search'),
+    path('metrics/', views.request_metrics, name='request_metrics'),
 ]
@@ -1,20 +1,184 @@
+import asyncio
+import json
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404, JsonResponse, QueryDict, StreamingHttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, CreateView, DeleteView
 from django.urls import reverse_lazy
-from .models import Task
+from .agenda import BUCKET_LABELS, BUCKETS, bucket_bounds, bucket_queryset, get_bucket_counts
+from .archive import ARCHIVE_AFTER_DAYS
+from .bulk import BulkOperationError, apply_operations
+from .caching import CSRF_PLACEHOLDER, FRAGMENT_TIMEOUT, aget_list_version, fragment_key, get_list_version
+from .conditional import get_list_validators, not_modified_response, set_validators
+from .fragments import form_errors_response, get_fragment_format, task_fragment_response
+from .instrumentation import metrics
+from .models import ArchivedTask, Task, TaskCounter
+from .pagination import decode_cursor, encode_cursor, keyset_after, keyset_page
+from .search import search_tasks
+from .transfer import CONTENT_TYPES, FORMATS, export_tasks
+from .writer import run_write
 
 
 class TaskListView(ListView):
     model = Task
     template_name = 'core/home.html'
     context_object_name = 'tasks'
+    page_size = 20
+    list_fields = ['title', 'description', 'completed', 'priority', 'due_date', 'created_at', 'updated_at']
+    sections = [
+        ('pending', False),
+        ('completed', True),
+    ]
+    section_labels = {
+        'pending': ('Pending Tasks', 'No pending tasks. Great job!'),
+        'completed': ('Completed Tasks', 'No completed tasks yet.'),
+    }
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = get_list_validators(request)
+        response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    def get_section_ids(self, name, completed):
+        # One page (plus one row to detect a next page) of ids for a section,
+        # walking the (completed, created_at, id) index from the cursor.
+        queryset = Task.objects.status(completed)
+        cursor = decode_cursor(self.request.GET.get(f'{name}_after'))
+        if cursor is not None:
+            queryset = queryset.filter(keyset_after(cursor))
+        return queryset.order_by('-created_at', '-id').values('pk')[:self.page_size + 1]
+
+    def get_queryset(self):
+        # Both sections are fetched with a single query.
+        section_filter = Q()
+        for name, completed in self.sections:
+            section_filter |= Q(pk__in=self.get_section_ids(name, completed))
+        return (
+            Task.objects.only(*self.list_fields)
+            .filter(section_filter)
+            .order_by('-created_at', '-id')
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['pending_tasks'] = Task.objects.filter(completed=False)
-        context['completed_tasks'] = Task.objects.filter(completed=True)
+        keys = self.get_fragment_keys(get_list_version())
+        fragments = cache.get_many(keys.values())
+
+        # Only query and render when a section isn't cached for this version.
+        missing = [name for name, key in keys.items() if key not in fragments]
+        if missing:
+            context.update(self.get_section_context(list(self.object_list), self.get_section_counts()))
+            rendered = self.render_fragments(keys, missing, context)
+            cache.set_many(rendered, FRAGMENT_TIMEOUT)
+            fragments.update(rendered)
+
+        context.update(self.get_section_html(keys, fragments))
+        return context
+
+    async def aget_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        keys = self.get_fragment_keys(await aget_list_version())
+        fragments = await cache.aget_many(keys.values())
+
+        missing = [name for name, key in keys.items() if key not in fragments]
+        if missing:
+            # The async ORM runs both queries one after the other on the
+            # thread-sensitive executor; awaiting them just means the
+            # request holds no thread while it waits.
+            tasks, counts = await asyncio.gather(
+                self.alist_tasks(),
+                self.aget_section_counts(),
+            )
+            context.update(self.get_section_context(tasks, counts))
+            rendered = self.render_fragments(keys, missing, context)
+            await cache.aset_many(rendered, FRAGMENT_TIMEOUT)
+            fragments.update(rendered)
+
+        context.update(self.get_section_html(keys, fragments))
+        return context
+
+    def get_fragment_keys(self, version):
+        page = '&'.join(
+            f'{name}_after={self.request.GET.get(f"{name}_after", "")}'
+            for name, _ in self.sections
+        )
+        return {name: fragment_key(name, version, page) for name, _ in self.sections}
+
+    def render_fragments(self, keys, names, context):
+        return {
+            keys[name]: render_to_string('core/task_section.html', self.get_fragment_context(name, context))
+            for name in names
+        }
+
+    def get_section_html(self, keys, fragments):
+        token = get_token(self.request)
+        return {
+            f'{name}_section': mark_safe(fragments[key].replace(CSRF_PLACEHOLDER, token))
+            for name, key in keys.items()
+        }
+
+    def get_section_context(self, tasks, counts):
+        context = {}
+        for name, completed in self.sections:
+            rows = [task for task in tasks if task.completed == completed]
+            page = rows[:self.page_size]
+            context[f'{name}_tasks'] = page
+            context[f'{name}_next_cursor'] = (
+                encode_cursor(page[-1]) if len(rows) > self.page_size else None
+            )
+            context[f'{name}_is_first_page'] = not self.request.GET.get(f'{name}_after')
+        context.update(counts)
         return context
 
+    def get_fragment_context(self, name, context):
+        title, empty_message = self.section_labels[name]
+        next_cursor = context[f'{name}_next_cursor']
+        return {
+            'name': name,
+            'title': title,
+            'empty_message': empty_message,
+            'tasks': context[f'{name}_tasks'],
+            'count': context[f'{name}_count'],
+            'newest_url': None if context[f'{name}_is_first_page'] else self.get_page_url(name, None),
+            'older_url': self.get_page_url(name, next_cursor) if next_cursor else None,
+            'csrf_token': CSRF_PLACEHOLDER,
+        }
+
+    def get_page_url(self, name, cursor):
+        # Sections are cached and shared between requests keyed on the cursor
+        # params alone (get_fragment_keys), so their links carry nothing else.
+        keep = [f'{section}_after' for section, _ in self.sections]
+        return page_url(self.request, f'{name}_after', cursor, keep=keep)
+
+    def get_counts_queryset(self):
+        # Read from the denormalized counters (counters.py), not core_task.
+        return TaskCounter.objects.by_status()
+
+    def format_section_counts(self, counts):
+        return {
+            f'{name}_count': counts.get(completed, 0)
+            for name, completed in self.sections
+        }
+
+    def get_section_counts(self):
+        return self.format_section_counts(dict(self.get_counts_queryset()))
+
+    async def aget_section_counts(self):
+        counts = {completed: count async for completed, count in self.get_counts_queryset()}
+        return self.format_section_counts(counts)
+
+    async def alist_tasks(self):
+        return [task async for task in self.object_list]
+
 
 class TaskCreateView(CreateView):
     model = Task
@@ -22,13 +186,140 @@ class TaskCreateView(CreateView):
     success_url = reverse_lazy('task_list')
 
     def form_valid(self, form):
-        return super().form_valid(form)
+        self.object = run_write(form.save)
+        format = get_fragment_format(self.request)
+        if format:
+            return task_fragment_response(self.request, format, self.object.pk, section_counts(), self.object)
+        return redirect(self.get_success_url())
 
+    def form_invalid(self, form):
+        if get_fragment_format(self.request):
+            return form_errors_response(form)
+        return super().form_invalid(form)
 
-def task_toggle(request, pk):
+
+def task_search(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    tasks, has_next = search_tasks(query, page=page)
+    return render(request, 'core/search.html', {
+        'query': query,
+        'tasks': tasks,
+        'page': page,
+        'has_next': has_next,
+    })
+
+
+def section_counts():
+    """Pending/completed counts for fragment responses."""
+    counts = TaskListView().get_section_counts()
+    return {name: counts[f'{name}_count'] for name, _ in TaskListView.sections}
+
+
+async def asection_counts():
+    counts = await TaskListView().aget_section_counts()
+    return {name: counts[f'{name}_count'] for name, _ in TaskListView.sections}
+
+
+def page_url(request, param, cursor, keep=None):
+    """Link to the page after `cursor`, keeping the other query params (or only those in `keep`)."""
+    query = QueryDict(mutable=True)
+    for key in request.GET if keep is None else keep:
+        if key in request.GET:
+            query.setlist(key, request.GET.getlist(key))
+    query.pop(param, None)
+    if cursor:
+        query[param] = cursor
+    return f'?{query.urlencode()}'
+
+
+def agenda(request):
+    bounds = bucket_bounds()
+    counts = get_bucket_counts(bounds)
+    sections = []
+    for bucket in BUCKETS:
+        param = f'{bucket}_after'
+        cursor = decode_cursor(request.GET.get(param))
+        tasks, next_cursor = keyset_page(
+            bucket_queryset(bucket, bounds), cursor, TaskListView.page_size, field='due_date', descending=False
+        )
+        title, empty_message = BUCKET_LABELS[bucket]
+        sections.append({
+            'name': bucket,
+            'title': title,
+            'count': counts[bucket],
+            'tasks': tasks,
+            'empty_message': empty_message,
+            'newest_url': page_url(request, param, None) if cursor is not None else None,
+            'older_url': page_url(request, param, next_cursor) if next_cursor else None,
+        })
+    return render(request, 'core/agenda.html', {'sections': sections})
+
+
+def agenda_bucket(request, bucket):
+    if bucket not in BUCKETS:
+        raise Http404(f'Unknown agenda bucket {bucket!r}.')
+    bounds = bucket_bounds()
+    queryset = bucket_queryset(bucket, bounds).only('title', 'priority', 'due_date')
+    tasks, next_cursor = keyset_page(
+        queryset, decode_cursor(request.GET.get('after')), TaskListView.page_size, field='due_date', descending=False
+    )
+    start, end = bounds[bucket]
+    return JsonResponse({
+        'bucket': bucket,
+        'start': start,
+        'end': end,
+        'tasks': [
+            {'id': task.pk, 'title': task.title, 'priority': task.priority, 'due_date': task.due_date}
+            for task in tasks
+        ],
+        'next': next_cursor,
+    })
+
+
+def task_archive(request):
+    tasks, next_cursor = keyset_page(
+        ArchivedTask.objects.order_by('-created_at', '-id'),
+        decode_cursor(request.GET.get('after')),
+        TaskListView.page_size,
+    )
+    return render(request, 'core/archive.html', {
+        'tasks': tasks,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
+        'archive_after_days': ARCHIVE_AFTER_DAYS,
+    })
+
+
+def task_export(request):
+    format = request.GET.get('format', 'ndjson')
+    if format not in FORMATS:
+        return JsonResponse({'errors': {'format': f"Expected one of {FORMATS}."}}, status=400)
+    response = StreamingHttpResponse(export_tasks(format), content_type=CONTENT_TYPES[format])
+    response['Content-Disposition'] = f'attachment; filename="tasks.{format}"'
+    return response
+
+
+@staff_member_required
+def request_metrics(request):
+    return JsonResponse(metrics.snapshot())
+
+
+def toggle_task(pk):
     task = get_object_or_404(Task, pk=pk)
     task.completed = not task.completed
-    task.save()
+    task.save(update_fields=['completed', 'updated_at'])
+    return task
+
+
+def task_toggle(request, pk):
+    task = run_write(toggle_task, pk)
+    format = get_fragment_format(request)
+    if format:
+        return task_fragment_response(request, format, task.pk, section_counts(), task)
     return redirect('task_list')
 
 
@@ -38,3 +329,26 @@ class TaskDeleteView(DeleteView):
 
     def get(self, request, *args, **kwargs):
         return self.post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        pk = self.object.pk
+        run_write(self.object.delete)
+        format = get_fragment_format(self.request)
+        if format:
+            return task_fragment_response(self.request, format, pk, section_counts())
+        return redirect(self.get_success_url())
+
+
+@require_POST
+def task_bulk(request):
+    try:
+        payload = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'errors': {'body': 'Invalid JSON.'}}, status=400)
+
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    try:
+        result = run_write(apply_operations, operations)
+    except BulkOperationError as e:
+        return JsonResponse({'errors': e.errors}, status=400)
+    return JsonResponse(result)
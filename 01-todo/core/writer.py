@@ -0,0 +1,103 @@
+"""
+Single writer for Task writes.
+
+SQLite allows one writer at a time. Rather than letting every request thread
+race for the write lock and wait out the busy timeout, writes are queued to
+one long-lived thread that applies them in order, each in its own
+transaction. Readers are unaffected thanks to WAL (see settings.py).
+"""
+import asyncio
+import contextvars
+import queue
+import threading
+from concurrent.futures import Future
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection, connections, transaction
+
+_STOP = object()
+
+
+class TaskWriter:
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """Queue `func(*args, **kwargs)` for the writer thread and return a Future."""
+        self._ensure_started()
+        future = Future()
+        # The job runs in the submitter's context, so per-request state such
+        # as the request profile (see instrumentation.py) follows it.
+        self._queue.put((future, contextvars.copy_context(), func, args, kwargs))
+        return future
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='task-writer', daemon=True)
+                self._thread.start()
+
+    def is_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def stop(self):
+        """Finish queued writes, close the writer's connection and end the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                connections.close_all()
+                return
+            future, context, func, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            # Mirror a request's lifecycle so the writer's persistent
+            # connection honours CONN_MAX_AGE and health checks.
+            close_old_connections()
+            try:
+                result = context.run(self._apply, func, args, kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                close_old_connections()
+
+    @staticmethod
+    def _apply(func, args, kwargs):
+        with transaction.atomic():
+            return func(*args, **kwargs)
+
+
+writer = TaskWriter()
+
+
+def _must_run_inline():
+    # Work inside an open transaction has to stay on that transaction's
+    # connection (this also covers tests wrapped in TestCase), and the writer
+    # must not queue work to itself.
+    return connection.in_atomic_block or writer.is_writer_thread()
+
+
+def run_write(func, *args, **kwargs):
+    """Run a write through the writer thread and return its result."""
+    if _must_run_inline():
+        return func(*args, **kwargs)
+    return writer.submit(func, *args, **kwargs).result()
+
+
+async def arun_write(func, *args, **kwargs):
+    """Async counterpart of run_write(); doesn't block the event loop while queued."""
+    if await sync_to_async(_must_run_inline)():
+        return await sync_to_async(func)(*args, **kwargs)
+    return await asyncio.wrap_future(writer.submit(func, *args, **kwargs))
@@ -0,0 +1,471 @@
+import asyncio
+import hashlib
+import re
+import time
+from html.parser import HTMLParser
+from typing import Callable, Iterable, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+
+import httpx
+from minsearch import AppendableIndex
+
+from search import create_appendable_index
+
+# Constants
+JINA_READER_URL = "https://r.jina.ai/"
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_PAGES = 100
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST_DELAY = 0.5
+REQUEST_TIMEOUT = 30.0
+
+# Only these are parsed and indexed when pages are fetched directly
+TEXT_CONTENT_TYPES = {'text/html', 'text/markdown', 'text/plain'}
+
+MARKDOWN_LINK_RE = re.compile(r'\[[^\]]*\]\((https?://[^)\s]+)\)')
+
+# Module-level state for the crawled index
+_crawl_index = None
+
+
+class _HTMLExtractor(HTMLParser):
+    """Collect visible text and link targets from an HTML page."""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'head'}
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.links.append(href)
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth and data.strip():
+            self.parts.append(data.strip())
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve a link against its page and normalize it for deduplication.
+
+    Args:
+        url: The raw link target
+        base: URL of the page the link was found on
+
+    Returns:
+        Normalized absolute http(s) URL, or None if the link is not crawlable
+    """
+    try:
+        if base is not None:
+            url = urljoin(base, url)
+        url, _ = urldefrag(url)
+        parts = urlsplit(url)
+    except ValueError:
+        # Malformed link, e.g. an unterminated IPv6 host like http://[bad/
+        return None
+
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or '/',
+        parts.query,
+        ''
+    ))
+
+
+def parse_page(body: str, content_type: str, url: str) -> tuple[str, list[str]]:
+    """
+    Turn a fetched page into markdown-ish text and the links it contains.
+
+    Args:
+        body: Response body
+        content_type: Value of the response Content-Type header
+        url: URL the page was fetched from
+
+    Returns:
+        Tuple of (content, absolute links)
+    """
+    if 'html' in content_type:
+        extractor = _HTMLExtractor()
+        extractor.feed(body)
+        content = '\n\n'.join(extractor.parts)
+        raw_links = extractor.links
+    else:
+        # Markdown or plain text (e.g. Jina Reader output)
+        content = body
+        raw_links = MARKDOWN_LINK_RE.findall(body)
+
+    links = []
+    for link in raw_links:
+        normalized = normalize_url(link, base=url)
+        if normalized is not None:
+            links.append(normalized)
+
+    return content, links
+
+
+class Crawler:
+    """
+    Bounded breadth-first crawler backed by an async worker pool.
+
+    URLs and page contents are deduplicated by hash, requests to the same host
+    are serialized and spaced by `per_host_delay`, and every new page is handed
+    to `on_document` as soon as it has been scraped.
+    """
+
+    def __init__(
+        self,
+        seed_urls: Iterable[str],
+        on_document: Callable[[dict], None],
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host_delay: float = DEFAULT_PER_HOST_DELAY,
+        same_host: bool = True,
+        use_reader: bool = True,
+    ):
+        self.seed_urls = [u for u in (normalize_url(s) for s in seed_urls) if u]
+        self.on_document = on_document
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.per_host_delay = per_host_delay
+        self.same_host = same_host
+        self.use_reader = use_reader
+
+        self.allowed_hosts = {urlsplit(u).netloc for u in self.seed_urls}
+        self.stats = {'fetched': 0, 'indexed': 0, 'duplicates': 0, 'skipped': 0, 'errors': 0}
+
+        self._queue = None
+        self._seen_urls = set()
+        self._seen_content = set()
+        self._host_locks = {}
+        self._host_last_fetch = {}
+        self._reserved = 0
+
+    def _enqueue(self, url: str, depth: int) -> None:
+        """Add a URL to the frontier unless it was already seen or is out of bounds."""
+        if depth > self.max_depth:
+            return
+        if self.same_host and urlsplit(url).netloc not in self.allowed_hosts:
+            return
+
+        url_hash = hashlib.sha1(url.encode('utf-8')).digest()
+        if url_hash in self._seen_urls:
+            return
+        self._seen_urls.add(url_hash)
+        self._queue.put_nowait((url, depth))
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        """Fetch a URL, waiting for the host's politeness delay first."""
+        host = urlsplit(url).netloc
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+
+        async with lock:
+            wait = self._host_last_fetch.get(host, 0.0) + self.per_host_delay - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                target = f"{JINA_READER_URL}{url}" if self.use_reader else url
+                response = await client.get(target)
+            finally:
+                self._host_last_fetch[host] = time.monotonic()
+
+        response.raise_for_status()
+        return response
+
+    async def _process(self, client: httpx.AsyncClient, url: str, depth: int) -> None:
+        """Fetch a single page, emit it if new and expand the frontier."""
+        if self._reserved >= self.max_pages:
+            return
+        self._reserved += 1
+
+        try:
+            response = await self._fetch(client, url)
+        except httpx.HTTPError as e:
+            print(f"Warning: Failed to fetch {url}: {e}")
+            self.stats['errors'] += 1
+            return
+        self.stats['fetched'] += 1
+
+        content_type = 'text/markdown' if self.use_reader else response.headers.get('content-type', '')
+        if content_type.split(';')[0].strip().lower() not in TEXT_CONTENT_TYPES:
+            # Images, PDFs, archives... would be decoded as junk text
+            self.stats['skipped'] += 1
+            return
+        content, links = parse_page(response.text, content_type, url)
+
+        content_hash = hashlib.sha1(content.encode('utf-8')).digest()
+        if content_hash in self._seen_content:
+            self.stats['duplicates'] += 1
+        elif content:
+            self._seen_content.add(content_hash)
+            self.on_document({'filename': url, 'content': content})
+            self.stats['indexed'] += 1
+
+        for link in links:
+            self._enqueue(link, depth + 1)
+
+    async def _worker(self, client: httpx.AsyncClient) -> None:
+        while True:
+            url, depth = await self._queue.get()
+            try:
+                await self._process(client, url, depth)
+            except Exception as e:
+                # A dead worker would leave its queue items unfinished and
+                # run() waiting on queue.join() forever.
+                print(f"Warning: Failed to process {url}: {e!r}")
+                self.stats['errors'] += 1
+            finally:
+                self._queue.task_done()
+
+    async def run(self) -> dict:
+        """
+        Crawl from the seed URLs until the frontier is exhausted or a limit is hit.
+
+        Returns:
+            Crawl statistics ('fetched', 'indexed', 'duplicates', 'skipped', 'errors')
+        """
+        self._queue = asyncio.Queue()
+        for url in self.seed_urls:
+            self._enqueue(url, 0)
+
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, follow_redirects=True, limits=limits) as client:
+            workers = [asyncio.create_task(self._worker(client)) for _ in range(self.concurrency)]
+            try:
+                await self._queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        return self.stats
+
+
+async def acrawl_into_index(
+    seed_urls: Iterable[str],
+    index: Optional[AppendableIndex] = None,
+    **kwargs
+) -> tuple[AppendableIndex, dict]:
+    """
+    Crawl from seed URLs and append every scraped page to a search index.
+
+    Args:
+        seed_urls: URLs to start crawling from
+        index: Index to append to (a new one is created if omitted)
+        **kwargs: Crawler options (max_depth, max_pages, concurrency,
+            per_host_delay, same_host, use_reader)
+
+    Returns:
+        Tuple of (index, crawl statistics)
+    """
+    if index is None:
+        index = create_appendable_index()
+
+    crawler = Crawler(seed_urls, on_document=index.append, **kwargs)
+    stats = await crawler.run()
+
+    print(f"Crawl finished: {stats}")
+    return index, stats
+
+
+def crawl_into_index(
+    seed_urls: Iterable[str],
+    index: Optional[AppendableIndex] = None,
+    **kwargs
+) -> tuple[AppendableIndex, dict]:
+    """
+    Synchronous `acrawl_into_index` for scripts.
+
+    Starts its own event loop, so it can't be called from async code
+    (such as an MCP tool); await `acrawl_into_index` there instead.
+    """
+    return asyncio.run(acrawl_into_index(seed_urls, index=index, **kwargs))
+
+
+async def acrawl_site(seed_urls: Iterable[str], **kwargs) -> dict:
+    """
+    Crawl from seed URLs into the module-level crawl index.
+
+    Args:
+        seed_urls: URLs to start crawling from
+        **kwargs: Crawler options, see `acrawl_into_index`
+
+    Returns:
+        Crawl statistics
+    """
+    global _crawl_index
+
+    _crawl_index, stats = await acrawl_into_index(seed_urls, index=_crawl_index, **kwargs)
+    return stats
+
+
+def search_crawled(query: str, num_results: int = 5) -> list[dict]:
+    """
+    Search the pages collected by `acrawl_site`.
+
+    Args:
+        query: Search query string
+        num_results: Number of results to return (default: 5)
+
+    Returns:
+        List of documents with 'content' and 'filename' (the page URL)
+    """
+    if _crawl_index is None:
+        return []
+    return _crawl_index.search(query, num_results=num_results)
+
+
+# Test functions
+
+def _serve_directory(directory: str):
+    """Start a static HTTP server for `directory` on a free local port."""
+    import functools
+    import threading
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_crawl_local_site():
+    """Test crawling a local static site into the search index"""
+    import tempfile
+    from pathlib import Path
+
+    print("Testing crawl_into_index()...")
+    print(f"{'='*80}\n")
+
+    pages = {
+        'index.html': '<a href="a.html">A</a> <a href="b.html#top">B</a> <a href="dup.html">Dup</a>'
+                      '<a href="bad.html">Bad</a> <a href="logo.png">Logo</a> <a href="https://example.com/">External</a><p>Home page</p>',
+        'a.html': '<a href="index.html">Back</a> <a href="deep/c.html">C</a><p>Alpha installation guide</p>',
+        'b.html': '<a href="a.html">A</a><p>Beta configuration reference</p>',
+        'dup.html': '<a href="a.html">A</a><p>Beta configuration reference</p>',
+        'deep/c.html': '<a href="d.html">D</a><p>Gamma deep page</p>',
+        'deep/d.html': '<p>Delta too deep</p>',
+        'bad.html': '<a href="http://[bad/">Broken</a> <a href="http://bad host/">Spaces</a><p>Epsilon broken links</p>',
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, body in pages.items():
+            path = Path(tmp) / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"<html><body>{body}</body></html>")
+        (Path(tmp) / 'logo.png').write_bytes(b'\x89PNG\r\n\x1a\n' + bytes(range(256)) + b'installation')
+
+        server = _serve_directory(tmp)
+        base = f"http://127.0.0.1:{server.server_address[1]}/"
+
+        try:
+            index, stats = crawl_into_index(
+                [base + 'index.html'],
+                max_depth=2,
+                max_pages=20,
+                concurrency=4,
+                per_host_delay=0.0,
+                use_reader=False,
+            )
+
+            # index, a, b, dup, bad, logo.png, deep/c fetched; deep/d is beyond
+            # max_depth, bad.html's malformed links are dropped and the image
+            # is not indexed
+            assert stats['fetched'] == 7, f"Expected 7 fetched pages, got {stats}"
+            assert stats['duplicates'] == 1, f"Expected 1 duplicate page, got {stats}"
+            assert stats['skipped'] == 1, f"Expected the image to be skipped, got {stats}"
+            assert stats['indexed'] == 5, f"Expected 5 indexed pages, got {stats}"
+            assert stats['errors'] == 0, f"Expected no errors, got {stats}"
+
+            results = index.search("installation", num_results=3)
+            assert [r['filename'] for r in results] == [base + 'a.html'], "Should find only the alpha page"
+            assert not index.search("delta", num_results=3), "Pages beyond max_depth should not be indexed"
+            print(f"✓ Depth-limited crawl indexed {stats['indexed']} page(s): {stats}")
+
+            # Page limit
+            _, limited = crawl_into_index(
+                [base + 'index.html'],
+                max_pages=2,
+                per_host_delay=0.0,
+                use_reader=False,
+            )
+            assert limited['fetched'] == 2, f"Expected 2 fetched pages, got {limited}"
+            print(f"✓ Page limit respected: {limited}")
+
+            # Politeness: requests to a single host are spaced out
+            start = time.monotonic()
+            crawl_into_index(
+                [base + 'index.html'],
+                max_depth=1,
+                per_host_delay=0.1,
+                use_reader=False,
+            )
+            elapsed = time.monotonic() - start
+            assert elapsed >= 0.5, f"Six requests with 0.1s delay took only {elapsed:.2f}s"
+            print(f"✓ Per-host delay respected ({elapsed:.2f}s)")
+
+            # A failure while handling one page is counted, not fatal
+            def failing_append(document):
+                if document['filename'].endswith('/a.html'):
+                    raise RuntimeError("index unavailable")
+
+            crawler = Crawler([base + 'index.html'], on_document=failing_append, max_depth=1, per_host_delay=0.0,
+                              use_reader=False)
+            failed = asyncio.run(asyncio.wait_for(crawler.run(), timeout=10))
+            assert failed['errors'] == 1, f"Expected one failed page, got {failed}"
+            assert failed['indexed'] == 3, f"Expected the other pages to be indexed, got {failed}"
+            print(f"✓ Page failures don't stop the crawl: {failed}")
+
+            # The MCP tool runs on the server's event loop, where
+            # crawl_into_index()'s asyncio.run() would fail.
+            from fastmcp import Client
+            from main import mcp
+
+            async def call_crawl_tools():
+                async with Client(mcp) as client:
+                    crawled = await client.call_tool("crawl_docs", {
+                        "seed_urls": [base + 'index.html'],
+                        "max_depth": 1,
+                        "use_reader": False,
+                    })
+                    found = await client.call_tool("search_crawled_docs", {"query": "installation"})
+                    return crawled.data, found.data
+
+            tool_stats, found = asyncio.run(call_crawl_tools())
+            assert tool_stats['indexed'] == 4, f"Expected 4 indexed pages, got {tool_stats}"
+            assert tool_stats['errors'] == 0, f"Expected no errors, got {tool_stats}"
+            assert [r['filename'] for r in found] == [base + 'a.html'], f"Should find the alpha page, got {found}"
+            print(f"✓ crawl_docs tool works on a running event loop: {tool_stats}")
+
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"\n{'='*80}")
+    print("✓ All crawl tests passed!")
+    print(f"{'='*80}\n")
+
+
+if __name__ == "__main__":
+    test_crawl_local_site()
@@ -1,5 +1,6 @@
 from fastmcp import FastMCP
 from search import search_docs
+from crawler import acrawl_site, search_crawled
 
 mcp = FastMCP("AI Zoomcamp Tools")
 
@@ -19,5 +20,43 @@ def search_fastmcp_docs(query: str, num_results: int = 5) -> list[dict]:
     return search_docs(query, num_results=num_results)
 
 
+@mcp.tool
+async def crawl_docs(
+    seed_urls: list[str],
+    max_depth: int = 2,
+    max_pages: int = 100,
+    use_reader: bool = True,
+) -> dict:
+    """
+    Crawl web pages starting from seed URLs and add them to the crawl index.
+
+    Args:
+        seed_urls: URLs to start crawling from (links are followed on the same hosts)
+        max_depth: Maximum number of links to follow from a seed (default: 2)
+        max_pages: Maximum number of pages to fetch (default: 100)
+        use_reader: Fetch pages through the Jina Reader API; set to False to
+            fetch them directly (default: True)
+
+    Returns:
+        Crawl statistics with 'fetched', 'indexed', 'duplicates', 'skipped' and 'errors' counts
+    """
+    return await acrawl_site(seed_urls, max_depth=max_depth, max_pages=max_pages, use_reader=use_reader)
+
+
+@mcp.tool
+def search_crawled_docs(query: str, num_results: int = 5) -> list[dict]:
+    """
+    Search the pages collected with crawl_docs.
+
+    Args:
+        query: The search query string
+        num_results: Number of results to return (default: 5)
+
+    Returns:
+        List of documents with 'filename' (page URL) and 'content' fields, ordered by relevance
+    """
+    return search_crawled(query, num_results=num_results)
+
+
 if __name__ == "__main__":
     mcp.run()
@@ -1,7 +1,7 @@
 from pathlib import Path
 import zipfile
 import httpx
-from minsearch import Index
+from minsearch import AppendableIndex, Index
 
 # Constants
 FASTMCP_ZIP_URL = "https://github.com/jlowin/fastmcp/archive/refs/heads/main.zip"
@@ -162,6 +162,20 @@ def create_search_index(documents: list[dict]) -> Index:
     return index
 
 
+def create_appendable_index() -> AppendableIndex:
+    """
+    Create an empty minsearch AppendableIndex with the same fields as
+    `create_search_index`, for documents that arrive one at a time.
+
+    Returns:
+        Empty AppendableIndex; add documents with `index.append(doc)`
+    """
+    return AppendableIndex(
+        text_fields=["content"],
+        keyword_fields=["filename"]
+    )
+
+
 def get_or_create_index() -> Index:
     """
     Get the cached index or create a new one if it doesn't exist.